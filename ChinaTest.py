@@ -38,21 +38,289 @@ Last Updated: December 2025
 Version: 1.0
 """
 
+import functools
 import re
 import sys
+import zipfile
+from array import array
+from collections import Counter
+from collections.abc import MutableSequence
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import date, datetime
+from itertools import islice
 from pathlib import Path
-from typing import Optional, Callable
+from io import BytesIO
+from typing import BinaryIO, Callable, Optional, Union
 from enum import Enum
 
 
+# Precompiled regex patterns
+# Filename: (SH|SZ)_PGTDRPT_<5 digits>_<8 digits>.xlsx
+_FILENAME_RE = re.compile(r'^(SH|SZ)_PGTDRPT_(\d{5})_(\d{8})\.xlsx$', re.IGNORECASE)
+# Broker code and report date are matched with fullmatch against the stripped cell
+_BROKER_RE = re.compile(r'\d{5}')
+_DATE_RE = re.compile(r'\d{8}')
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_yyyymmdd(value: str) -> datetime:
+    """Parse a YYYYMMDD string (memoized: every row in a file usually shares one report date)"""
+    return datetime.strptime(value, '%Y%m%d')
+
+
+def _parse_ratios(value: str) -> list[tuple[str, str]]:
+    """Split a fund source ratio (e.g. "自有资金80%;募集资金20%") into (source, percent) pairs.
+
+    Returns the same pairs as re.findall(r'([^;]+?)(\\d+(?:\\.\\d+)?)\\s*%', value), but in
+    linear time: each '%' is matched by scanning back over the number in front of it, where
+    the regex backtracks cubically on long digit runs such as '1' * n + 'x%'.
+    """
+    pairs = []
+    for part in value.split(';'):
+        start = 0  # Start of the next source name; it must be at least one character long
+        pct = part.find('%')
+        while pct != -1:
+            end = pct  # End of the number, before any whitespace ahead of the '%'
+            while end > start and part[end - 1].isspace():
+                end -= 1
+            digits = end  # Start of the digit run ending at `end`
+            while digits > start and part[digits - 1].isdecimal():
+                digits -= 1
+            num_start = -1
+            if digits < end:
+                # The run may be the fraction of an "integer.fraction" number
+                if digits >= 2 and part[digits - 1] == '.' and part[digits - 2].isdecimal():
+                    int_start = digits - 2
+                    while int_start > start and part[int_start - 1].isdecimal():
+                        int_start -= 1
+                    if max(start + 1, int_start) <= digits - 2:
+                        num_start = max(start + 1, int_start)
+                if num_start == -1 and max(start + 1, digits) < end:
+                    num_start = max(start + 1, digits)
+            if num_start != -1:
+                pairs.append((part[start:num_start], part[num_start:end]))
+                start = pct + 1
+            pct = part.find('%', pct + 1)
+    return pairs
+
+
+def _read_first_sheet_calamine(source) -> Optional[list[list]]:
+    """Return the cell values of a single-sheet workbook (path or binary file-like) via
+    python-calamine, anchored at A1
+
+    Returns None when python-calamine is not installed, the workbook has several sheets
+    (openpyxl's active sheet is used then, which calamine can't identify), it has cells
+    calamine reads differently (see _has_calamine_misread_cells) or it can't be parsed;
+    the caller falls back to openpyxl, which reports unreadable files.
+    """
+    try:
+        from python_calamine import CalamineWorkbook
+    except ImportError:
+        return None
+    try:
+        if _has_calamine_misread_cells(source):
+            return None
+        with CalamineWorkbook.from_object(source if hasattr(source, "read") else str(source)) as workbook:
+            if len(workbook.sheet_names) != 1:
+                return None
+            return workbook.get_sheet_by_index(0).to_python(skip_empty_area=False)
+    except Exception:
+        return None
+
+
+def _has_calamine_misread_cells(source) -> bool:
+    """Whether a workbook has cells python-calamine reads differently from openpyxl: error
+    cells, which calamine returns as '', and unpreserved edge whitespace, which it trims"""
+    if hasattr(source, "seek"):
+        source.seek(0)
+    with zipfile.ZipFile(source) as archive:
+        for name in archive.namelist():
+            if not ((name.startswith("xl/worksheets/") or name == "xl/sharedStrings.xml") and name.endswith(".xml")):
+                continue
+            data = archive.read(name)
+            if b' t="e"' in data or b" t='e'" in data or _has_unpreserved_edge_space(data):
+                return True
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return False
+
+
+def _has_unpreserved_edge_space(data: bytes) -> bool:
+    """Whether sheet XML has a <t> text element with leading or trailing whitespace and no
+    xml:space="preserve" (calamine trims such text, openpyxl keeps it)"""
+    # Scanned with bytes.find rather than a regex: without a literal prefix the regex is
+    # several times slower on large sheets. Tabs and line breaks are rare in sheet XML, so
+    # each occurrence is checked; spaces are common, so only "> " and " </" are.
+    for pattern in (b"> ", b" </"):
+        pos = data.find(pattern)
+        while pos != -1:
+            if _is_unpreserved_text_edge(data, pos + 1 if pattern == b"> " else pos):
+                return True
+            pos = data.find(pattern, pos + 1)
+    for space in (b"\t", b"\n", b"\r"):
+        pos = data.find(space)
+        while pos != -1:
+            if _is_unpreserved_text_edge(data, pos):
+                return True
+            pos = data.find(space, pos + 1)
+    return False
+
+
+def _is_unpreserved_text_edge(data: bytes, pos: int) -> bool:
+    """Whether the whitespace byte at pos starts or ends the text of a <t> element that
+    has no xml:space="preserve" """
+    if data[pos - 1] == ord(">"):
+        # Text starts here: the element is a <t> (or <x:t>) opened without attributes
+        tag = data[data.rfind(b"<", 0, pos):pos]
+        if tag == b"<t>" or (tag.endswith(b":t>") and not tag.startswith(b"</") and b" " not in tag):
+            return True
+    if data.startswith(b"</", pos + 1):
+        # Text ends here: the element is closed by </t> (or </x:t>), and text holds no '<',
+        # so the last '<' before it opens the element
+        name = data[pos + 3:data.find(b">", pos)]
+        if (name == b"t" or name.endswith(b":t")) and b"preserve" not in data[data.rfind(b"<", 0, pos):pos]:
+            return True
+    return False
+
+
+def _calamine_row(row: list) -> list:
+    """Convert a python-calamine row to the values openpyxl would return for it"""
+    for i, value in enumerate(row):
+        value_type = type(value)
+        # calamine returns every number as float; openpyxl keeps whole numbers as int
+        if value_type is float:
+            if value.is_integer() and abs(value) < 2 ** 53:
+                row[i] = int(value)
+        # calamine returns date-formatted whole days as date; openpyxl as datetime
+        elif value_type is date:
+            row[i] = datetime(value.year, value.month, value.day)
+    return row
+
+
+# Fields still required when report_type is 停止使用
+_STOP_REQUIRED_FIELDS = ("ep_name", "broker_code", "account_name", "client_code", "report_date")
+
+# Report types that trigger the full set of conditional requirements
+_FIRST_OR_CHANGE = frozenset({"首次", "变更"})
+
+# High frequency thresholds
+_HIGH_FREQ_RATES = frozenset({"500笔及以上", "300笔至499笔"})
+_HIGH_FREQ_DAILY = frozenset({"25000笔及以上", "20000笔至24999笔"})
+
+# Row state bits for conditional requirements. Each row's facts are packed into one int
+# (see _shanghai_row_state / _shenzhen_row_state), and a field is conditionally required
+# when (state & req_mask) == req_bits.
+_FIRST_OR_CHANGE_BIT = 1 << 0        # report_type is 首次/变更
+_HAS_LEVERAGE_BIT = 1 << 1           # fund_sources includes 杠杆资金
+_QUANTITATIVE_BIT = 1 << 2           # is_quantitative is 是
+_MAIN_STRATEGY_OTHER_BIT = 1 << 3    # main_strategy is 其他
+_SUB_STRATEGY_OTHER_BIT = 1 << 4     # sub_strategy includes 其他
+_HIGH_FREQ_BIT = 1 << 5              # max_order_rate or max_daily_orders at a high-freq level
+_NO_TEST_REPORT_BIT = 1 << 6         # upload_test_report is 否
+_TEST_REPORT_EXEMPT_BIT = 1 << 7     # upload_test_report is 已申请豁免
+_FUND_SOURCE_OTHER_BIT = 1 << 8      # fund_sources includes 其他
+_LEVERAGE_SOURCE_OTHER_BIT = 1 << 9  # leverage_sources includes 其他
+_MAIN_STRATEGY_FILLED_BIT = 1 << 10  # main_strategy is filled
+_SUB_STRATEGY_FILLED_BIT = 1 << 11   # sub_strategy is filled
+_EXECUTION_OTHER_BIT = 1 << 12       # execution_method includes 其他
+
+# Conditional requirements as (req_mask, req_bits), keyed by condition name
+_CONDITIONS = {
+    "first_or_change": (_FIRST_OR_CHANGE_BIT, _FIRST_OR_CHANGE_BIT),
+    "fund_source_other": (_FUND_SOURCE_OTHER_BIT, _FUND_SOURCE_OTHER_BIT),
+    "has_leverage": (_HAS_LEVERAGE_BIT, _HAS_LEVERAGE_BIT),
+    "leverage_source_other": (_LEVERAGE_SOURCE_OTHER_BIT, _LEVERAGE_SOURCE_OTHER_BIT),
+    "quantitative": (_QUANTITATIVE_BIT, _QUANTITATIVE_BIT),
+    "main_strategy_other": (_MAIN_STRATEGY_OTHER_BIT, _MAIN_STRATEGY_OTHER_BIT),
+    "main_strategy_filled": (_MAIN_STRATEGY_FILLED_BIT, _MAIN_STRATEGY_FILLED_BIT),
+    "sub_strategy_other": (_SUB_STRATEGY_OTHER_BIT, _SUB_STRATEGY_OTHER_BIT),
+    "sub_strategy_filled": (_SUB_STRATEGY_FILLED_BIT, _SUB_STRATEGY_FILLED_BIT),
+    "execution_other": (_EXECUTION_OTHER_BIT, _EXECUTION_OTHER_BIT),
+    # High-freq first/change report that hasn't applied for exemption
+    "high_freq_no_exempt": (_FIRST_OR_CHANGE_BIT | _HIGH_FREQ_BIT | _TEST_REPORT_EXEMPT_BIT,
+                            _FIRST_OR_CHANGE_BIT | _HIGH_FREQ_BIT),
+    # QFII code required when high-freq but not uploading a test report (order-splitting
+    # exemption for QFII investors, per the Excel template comment)
+    "qfii_exemption": (_FIRST_OR_CHANGE_BIT | _HIGH_FREQ_BIT | _NO_TEST_REPORT_BIT,
+                       _FIRST_OR_CHANGE_BIT | _HIGH_FREQ_BIT | _NO_TEST_REPORT_BIT),
+}
+
+
+def _shanghai_row_state(cells: list, first_or_change: bool, has_leverage: bool) -> int:
+    """Row state bits for a Shanghai row's stripped cells (fund_sources 11, leverage_sources 15,
+    is_quantitative 19, main_strategy 20, sub_strategy 23, execution_method 28,
+    max_order_rate 31, max_daily_orders 32, upload_test_report 40)"""
+    state = 0
+    if first_or_change:
+        state |= _FIRST_OR_CHANGE_BIT
+    if has_leverage:
+        state |= _HAS_LEVERAGE_BIT
+    if "其他" in cells[11]:
+        state |= _FUND_SOURCE_OTHER_BIT
+    if "其他" in cells[15]:
+        state |= _LEVERAGE_SOURCE_OTHER_BIT
+    if cells[19] == "是":
+        state |= _QUANTITATIVE_BIT
+    main_strategy = cells[20]
+    if main_strategy:
+        state |= _MAIN_STRATEGY_FILLED_BIT
+        if main_strategy == "其他":
+            state |= _MAIN_STRATEGY_OTHER_BIT
+    sub_strategy = cells[23]
+    if sub_strategy:
+        state |= _SUB_STRATEGY_FILLED_BIT
+        if "其他" in sub_strategy:
+            state |= _SUB_STRATEGY_OTHER_BIT
+    if "其他" in cells[28]:
+        state |= _EXECUTION_OTHER_BIT
+    if cells[31] in _HIGH_FREQ_RATES or cells[32] in _HIGH_FREQ_DAILY:
+        state |= _HIGH_FREQ_BIT
+    upload_report = cells[40]
+    if upload_report == "否":
+        state |= _NO_TEST_REPORT_BIT
+    elif upload_report == "已申请豁免":
+        state |= _TEST_REPORT_EXEMPT_BIT
+    return state
+
+
+def _shenzhen_row_state(cells: list, first_or_change: bool, has_leverage: bool) -> int:
+    """Row state bits for a Shenzhen row's stripped cells (is_quantitative 18, main_strategy 19,
+    sub_strategy 21, max_order_rate 27, max_daily_orders 28, upload_test_report 36).
+    Shenzhen has no "other ..." description fields, so those bits are never set."""
+    state = 0
+    if first_or_change:
+        state |= _FIRST_OR_CHANGE_BIT
+    if has_leverage:
+        state |= _HAS_LEVERAGE_BIT
+    if cells[18] == "是":
+        state |= _QUANTITATIVE_BIT
+    if cells[19]:
+        state |= _MAIN_STRATEGY_FILLED_BIT
+    if cells[21]:
+        state |= _SUB_STRATEGY_FILLED_BIT
+    if cells[27] in _HIGH_FREQ_RATES or cells[28] in _HIGH_FREQ_DAILY:
+        state |= _HIGH_FREQ_BIT
+    upload_report = cells[36]
+    if upload_report == "否":
+        state |= _NO_TEST_REPORT_BIT
+    elif upload_report == "已申请豁免":
+        state |= _TEST_REPORT_EXEMPT_BIT
+    return state
+
+
 class Severity(Enum):
     ERROR = "ERROR"
     WARNING = "WARNING"
 
 
-@dataclass
+# Severity <-> byte code for the packed error store
+_SEVERITIES = (Severity.ERROR, Severity.WARNING)
+_SEVERITY_CODES = {severity: code for code, severity in enumerate(_SEVERITIES)}
+_ERROR_CODE = _SEVERITY_CODES[Severity.ERROR]
+_WARNING_CODE = _SEVERITY_CODES[Severity.WARNING]
+
+
+@dataclass(slots=True)
 class ValidationError:
     row_num: int
     field_name_cn: str  # Chinese field name
@@ -65,21 +333,42 @@ class ValidationError:
     client_code: str = ""
 
     def __str__(self):
-        context = ""
-        if self.account_name or self.client_code:
-            parts = []
-            if self.account_name:
-                parts.append(f"Account: {self.account_name}")
-            if self.client_code:
-                parts.append(f"BCAN: {self.client_code}")
-            context = f" [{', '.join(parts)}]"
+        return _format_error(self.row_num, self.field_name_cn, self.field_name_en, self.field_col,
+                             self.field_value, self.message, self.severity, self.account_name, self.client_code)
+
+
+def _format_error(row_num: int, field_name_cn: str, field_name_en: str, field_col: int, field_value: str,
+                  message: str, severity: Severity, account_name: str, client_code: str) -> str:
+    """Format a single error line for reports"""
+    return _format_error_line(row_num, _format_error_context(account_name, client_code),
+                              _format_error_field(field_name_cn, field_name_en, field_col),
+                              field_value, message, severity)
+
+
+def _format_error_line(row_num: int, context: str, field_info: str, field_value: str, message: str,
+                       severity: Severity) -> str:
+    # Format: [ERROR] Row 1 [Account: X, BCAN: Y], Column 3 '账户名称' (account_name): message (value: 'X')
+    return f"[{severity.value}] Row {row_num}{context}, {field_info}: {message} (value: '{field_value}')"
+
 
-        # Format: [ERROR] Row 1 [Account: X, BCAN: Y], Column 3 '账户名称' (account_name): message (value: 'X')
-        field_info = f"Column {self.field_col} '{self.field_name_cn}' ({self.field_name_en})" if self.field_col > 0 else f"'{self.field_name_cn}'"
-        return f"[{self.severity.value}] Row {self.row_num}{context}, {field_info}: {self.message} (value: '{self.field_value}')"
+def _format_error_context(account_name: str, client_code: str) -> str:
+    """Format the " [Account: X, BCAN: Y]" part of an error line ("" without context)"""
+    if not (account_name or client_code):
+        return ""
+    parts = []
+    if account_name:
+        parts.append(f"Account: {account_name}")
+    if client_code:
+        parts.append(f"BCAN: {client_code}")
+    return f" [{', '.join(parts)}]"
 
 
-@dataclass
+def _format_error_field(field_name_cn: str, field_name_en: str, field_col: int) -> str:
+    """Format the field part of an error line"""
+    return f"Column {field_col} '{field_name_cn}' ({field_name_en})" if field_col > 0 else f"'{field_name_cn}'"
+
+
+@dataclass(slots=True)
 class RowValidationResult:
     """Result of validating a single row"""
     row_num: int
@@ -90,7 +379,7 @@ class RowValidationResult:
     warning_count: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class FieldSpec:
     """Specification for a single field"""
     index: int
@@ -98,12 +387,87 @@ class FieldSpec:
     name_en: str
     max_length: int
     required: bool = False  # Always required
-    conditional_required: Optional[Callable] = None  # Conditionally required
-    valid_values: Optional[list] = None  # Enumerated values (Chinese)
+    req_mask: int = 0  # Conditionally required when (row state & req_mask) == req_bits; 0 = never
+    req_bits: int = 0
+    valid_values: Optional[list] = None  # Enumerated values (Chinese), in display order
     multi_value: bool = False  # Can contain multiple values separated by ;
     max_multi_count: Optional[int] = None  # Maximum number of values if multi
     validator: Optional[Callable] = None  # Custom validation function
     description: str = ""
+    valid_set: Optional[frozenset] = field(default=None, init=False, repr=False)  # For membership checks
+    valid_text: str = field(default="", init=False, repr=False)  # valid_values joined for error messages
+
+    def __post_init__(self):
+        if self.valid_values is not None:
+            self.valid_set = frozenset(self.valid_values)
+            self.valid_text = ", ".join(self.valid_values)
+
+
+class ErrorList(MutableSequence):
+    """Mutable list view of an SSEValidator's recorded errors and warnings
+
+    Items are materialized as new ValidationError objects on every read, so they are
+    copies: changing an attribute of one (e.g. errors[0].message = ...) does not change the
+    recorded error; assign the changed object back (errors[0] = error) instead.
+    ValidationErrors that are assigned, inserted or appended are packed into the
+    validator's error columns. Reading len() is O(1). Use SSEValidator.iter_errors() to
+    walk the errors.
+    """
+    __slots__ = ("_validator",)
+
+    def __init__(self, validator: "SSEValidator"):
+        self._validator = validator
+
+    def __len__(self):
+        return len(self._validator._err_row)
+
+    def __getitem__(self, index):
+        validator = self._validator
+        if isinstance(index, slice):
+            return [validator._materialize_error(i) for i in range(*index.indices(len(self)))]
+        return validator._materialize_error(range(len(self))[index])
+
+    def __setitem__(self, index, value):
+        validator = self._validator
+        if isinstance(index, slice):
+            errors = list(self)
+            errors[index] = value
+            validator.errors = errors
+            return
+        i = range(len(self))[index]
+        for column, item in zip(validator._error_columns(), validator._encode_error(value)):
+            column[i] = item
+
+    def __delitem__(self, index):
+        validator = self._validator
+        if not isinstance(index, slice):
+            index = range(len(self))[index]
+        for column in validator._error_columns():
+            del column[index]
+        if not len(self):
+            validator.errors = []  # Also drops the field name and context tables
+
+    def insert(self, index: int, value: ValidationError):
+        validator = self._validator
+        for column, item in zip(validator._error_columns(), validator._encode_error(value)):
+            column.insert(index, item)
+
+    def __iter__(self):
+        return self._validator.iter_errors()
+
+    def __eq__(self, other):
+        if isinstance(other, (ErrorList, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __repr__(self):
+        return repr(list(self))
 
 
 class SSEValidator:
@@ -128,22 +492,147 @@ class SSEValidator:
     ]
 
     # High frequency thresholds
-    HIGH_FREQ_RATES = ["500笔及以上", "300笔至499笔"]
-    HIGH_FREQ_DAILY = ["25000笔及以上", "20000笔至24999笔"]
+    HIGH_FREQ_RATES = _HIGH_FREQ_RATES
+    HIGH_FREQ_DAILY = _HIGH_FREQ_DAILY
 
     # Special value for consolidated reporting
     REPORTED_ELSEWHERE = "已在其他联交所参与者报告"
     EXEMPT_VALUE = "已申请豁免"
 
     def __init__(self):
-        self.errors: list[ValidationError] = []
+        # Errors are stored as compact records (see add_error); the `errors` property
+        # and format_error() materialize them
+        self._reset_errors()
         self.row_results: list[RowValidationResult] = []
         self.exchange_type: Optional[str] = None  # SHANGHAI, SHENZHEN, or None
         self.submission_date: Optional[datetime] = None  # Date from filename (submission date)
         self.firm_id: Optional[str] = None  # Broker code from filename (5-digit FIRM_ID)
-        self.field_specs = {}  # Will be built after exchange type is detected
+        self.field_specs: tuple[FieldSpec, ...] = ()  # Indexed by field position; built after exchange type is detected
+        self._en_to_idx: dict[str, int] = {}  # English field name -> field index
+        self._cn_to_idx: dict[str, int] = {}  # Chinese field name -> field index
+        self._field_checks: tuple[tuple, ...] = ()  # Per-field check plan, see _build_field_checks
+        self._row_state = _shanghai_row_state  # Row state bits for conditional requirements
+        self._multi_value_messages: dict[tuple[int, str], str] = {}  # (field index, cell) -> error message or ""
+        self._set_hot_field_indices()
         self.header_row = None
-        self.current_row_context = {"account_name": "", "client_code": ""}
+        # Account name and client code of the row being validated (context for errors)
+        self._ctx_account = ""
+        self._ctx_client = ""
+
+    @property
+    def errors(self) -> ErrorList:
+        """Recorded errors and warnings, as a mutable list view whose items are copies (see ErrorList)"""
+        return ErrorList(self)
+
+    @errors.setter
+    def errors(self, value):
+        errors = list(value)  # Copied first: value may be a view of the errors being replaced
+        account_name, client_code = self._ctx_account, self._ctx_client
+        self._reset_errors()
+        self._set_row_context(account_name, client_code)
+        self.errors.extend(errors)
+
+    def iter_errors(self):
+        """Yield recorded errors and warnings as ValidationError objects, in the order added"""
+        for i in range(len(self._err_row)):
+            yield self._materialize_error(i)
+
+    def _reset_errors(self):
+        """Clear recorded errors and the per-file context table"""
+        # Errors are stored column-wise, one entry per error in each column
+        self._err_row = array('i')    # Row number
+        self._err_field = array('i')  # Spec index, or ~i for _err_field_names[i]
+        self._err_value: list[str] = []
+        self._err_msg: list[str] = []
+        self._err_sev = array('b')    # Index into _SEVERITIES
+        self._err_ctx = array('i')    # Index into _contexts
+        self._err_field_names: list[tuple[str, str, int]] = []  # (name_cn, name_en, column) for fields without a spec
+        self._err_field_name_keys: dict[tuple[str, str, int], int] = {}  # Entry -> index in _err_field_names
+        self._contexts: list[tuple[str, str]] = [("", "")]  # Unique (account_name, client_code) pairs
+        self._context_keys: dict[tuple[str, str], int] = {("", ""): 0}
+        self._ctx_key = 0  # Index into _contexts for the row being validated
+        # Formatted context / field text by ctx_key / field, filled by format_error
+        self._context_texts: dict[int, str] = {}
+        self._field_texts: dict[int, str] = {}
+
+    def _context_key(self, account_name: str, client_code: str) -> int:
+        """Return the index of (account_name, client_code) in _contexts, adding it if new"""
+        ctx = (account_name, client_code)
+        key = self._context_keys.get(ctx)
+        if key is None:
+            key = self._context_keys[ctx] = len(self._contexts)
+            self._contexts.append(ctx)
+        return key
+
+    def _set_row_context(self, account_name: str, client_code: str):
+        """Set the (account, client) context attached to subsequently added errors"""
+        self._ctx_key = self._context_key(account_name, client_code)
+        self._ctx_account = account_name
+        self._ctx_client = client_code
+
+    def _error_field_names(self, field: int) -> tuple[str, str, int]:
+        """Return (name_cn, name_en, column) for a recorded field (spec index or ~side-table index)"""
+        if field >= 0:
+            spec = self.field_specs[field]
+            return spec.name_cn, spec.name_en, field + 1
+        return self._err_field_names[~field]
+
+    def _error_fields(self, i: int) -> tuple:
+        """Return the ValidationError fields of the i-th recorded error"""
+        name_cn, name_en, col = self._error_field_names(self._err_field[i])
+        account_name, client_code = self._contexts[self._err_ctx[i]]
+        return (self._err_row[i], name_cn, name_en, col, self._err_value[i], self._err_msg[i],
+                _SEVERITIES[self._err_sev[i]], account_name, client_code)
+
+    def _field_key(self, field_name_cn: str, field_name_en: str, field_col: int) -> int:
+        """Return the _err_field value for a field: its spec index when the names match the
+        spec at that column, else ~i for its (deduplicated) entry in _err_field_names"""
+        idx = field_col - 1
+        if 0 <= idx < len(self.field_specs):
+            spec = self.field_specs[idx]
+            if spec.name_cn == field_name_cn and spec.name_en == field_name_en:
+                return idx
+        names = (field_name_cn, field_name_en, field_col)
+        i = self._err_field_name_keys.get(names)
+        if i is None:
+            i = self._err_field_name_keys[names] = len(self._err_field_names)
+            self._err_field_names.append(names)
+        return ~i
+
+    def _error_columns(self) -> tuple:
+        """The error columns, in the order of _encode_error's values"""
+        return self._err_row, self._err_field, self._err_value, self._err_msg, self._err_sev, self._err_ctx
+
+    def _encode_error(self, error: ValidationError) -> tuple:
+        """Return the column values that record `error` (the inverse of _error_fields)"""
+        return (error.row_num, self._field_key(error.field_name_cn, error.field_name_en, error.field_col),
+                error.field_value, error.message, _SEVERITY_CODES[error.severity],
+                self._context_key(error.account_name, error.client_code))
+
+    def _materialize_error(self, i: int) -> ValidationError:
+        return ValidationError(*self._error_fields(i))
+
+    def format_error(self, i: int) -> str:
+        """Format the i-th recorded error the same way as str(ValidationError)"""
+        # Errors share a handful of row contexts and fields, so their text is formatted once
+        ctx_key = self._err_ctx[i]
+        context = self._context_texts.get(ctx_key)
+        if context is None:
+            context = self._context_texts[ctx_key] = _format_error_context(*self._contexts[ctx_key])
+        field = self._err_field[i]
+        field_info = self._field_texts.get(field)
+        if field_info is None:
+            field_info = self._field_texts[field] = _format_error_field(*self._error_field_names(field))
+        return _format_error_line(self._err_row[i], context, field_info, self._err_value[i], self._err_msg[i],
+                                  _SEVERITIES[self._err_sev[i]])
+
+    def _append_error(self, row_num: int, field: int, value: str, message: str, severity: Severity):
+        self._err_row.append(row_num)
+        self._err_field.append(field)
+        self._err_value.append(value)
+        self._err_msg.append(message)
+        self._err_sev.append(_SEVERITY_CODES[severity])
+        self._err_ctx.append(self._ctx_key)
 
     @staticmethod
     def detect_exchange(filename: str) -> tuple[Optional[str], Optional[datetime], Optional[str], Optional[str]]:
@@ -166,8 +655,7 @@ class SSEValidator:
             YYYYMMDD: Date in format YYYYMMDD (e.g., "20250805")
         """
         # Pattern: (SH|SZ)_PGTDRPT_<5 digits>_<8 digits>.xlsx
-        pattern = r'^(SH|SZ)_PGTDRPT_(\d{5})_(\d{8})\.xlsx$'
-        match = re.match(pattern, filename, re.IGNORECASE)
+        match = _FILENAME_RE.match(filename)
 
         if not match:
             return None, None, None, (
@@ -183,7 +671,7 @@ class SSEValidator:
 
         # Validate date format (basic check - YYYYMMDD should be valid)
         try:
-            submission_date = datetime.strptime(date_str, '%Y%m%d')
+            submission_date = _parse_yyyymmdd(date_str)
         except ValueError:
             return None, None, None, f"Invalid date in filename: {date_str}. Expected format: YYYYMMDD"
 
@@ -200,281 +688,73 @@ class SSEValidator:
         else:
             return None, None, None, f"Unknown exchange code: {exchange_code}"
 
-    def _build_field_specs(self, exchange_type: str = "SHANGHAI") -> dict[int, FieldSpec]:
-        """Build field specifications based on exchange requirements
+    def _build_field_specs(self, exchange_type: str = "SHANGHAI") -> tuple[FieldSpec, ...]:
+        """Build field specifications based on exchange requirements (cached per class and exchange)
 
         Args:
             exchange_type: "SHANGHAI" or "SHENZHEN"
         """
-        specs = {}
-
-        # Determine if this is Shenzhen (has 序号 field at position 0)
-        is_shenzhen = (exchange_type == "SHENZHEN")
-
-        # Field index offset for Shenzhen (+1 due to 序号 column)
-        offset = 1 if is_shenzhen else 0
-
-        # Helper functions for conditional requirements (adjusted for offset)
-        def req_if_first_or_change(row):
-            return row.get(7 + offset, "") in ["首次", "变更"]
-
-        def req_if_fund_source_other(row):
-            # Shenzhen doesn't have "其他资金来源描述" field - never required
-            if is_shenzhen:
-                return False
-            return "其他" in row.get(11 + offset, "")
-
-        def req_if_has_leverage(row):
-            return "杠杆资金" in row.get(11 + offset, "")
-
-        def req_if_leverage_source_other(row):
-            # Shenzhen doesn't have "其他杠杆资金来源描述" field - never required
-            if is_shenzhen:
-                return False
-            return "其他" in row.get(15 + offset, "")
-
-        def req_if_quantitative(row):
-            return row.get(19 + offset, "") == "是"
-
-        def req_if_main_strategy_other(row):
-            # Shenzhen doesn't have "其他主策略类型" field - never required
-            if is_shenzhen:
-                return False
-            return row.get(20 + offset, "") == "其他"
-
-        def req_if_main_strategy_filled(row):
-            return bool(row.get(20 + offset, "").strip())
-
-        def req_if_sub_strategy_other(row):
-            # Shenzhen doesn't have "其他辅策略类型" field - never required
-            if is_shenzhen:
-                return False
-            return "其他" in row.get(23 + offset, "")
-
-        def req_if_sub_strategy_filled(row):
-            # For Shenzhen,辅策略类型 is at index 22, for Shanghai it's at 23
-            idx = 22 if is_shenzhen else 23
-            return bool(row.get(idx + offset, "").strip())
-
-        def req_if_execution_other(row):
-            # Shenzhen doesn't have "其他方式描述" field - never required
-            if is_shenzhen:
-                return False
-            # For Shanghai, execution_method is at index 28
-            return "其他" in row.get(28 + offset, "")
-
-        def req_if_high_freq_no_exempt(row):
-            # For Shenzhen: max_order_rate at 28, max_daily_orders at 29, upload_test_report at 37
-            # For Shanghai: max_order_rate at 31, max_daily_orders at 32, upload_test_report at 40
-            if is_shenzhen:
-                rate_idx, daily_idx, upload_idx = 28, 29, 37
-            else:
-                rate_idx, daily_idx, upload_idx = 31, 32, 40
-
-            rate = row.get(rate_idx + offset, "")
-            daily = row.get(daily_idx + offset, "")
-            is_high_freq = rate in self.HIGH_FREQ_RATES or daily in self.HIGH_FREQ_DAILY
-            is_exempt = row.get(upload_idx + offset, "") == "已申请豁免"
-            return is_high_freq and not is_exempt and req_if_first_or_change(row)
-
-        def req_if_qfii_exemption(row):
-            """QFII code required when using order-splitting exemption for high-freq reporting"""
-            # For Shenzhen: max_order_rate at 28, max_daily_orders at 29, upload_test_report at 37
-            # For Shanghai: max_order_rate at 31, max_daily_orders at 32, upload_test_report at 40
-            if is_shenzhen:
-                rate_idx, daily_idx, upload_idx = 28, 29, 37
-            else:
-                rate_idx, daily_idx, upload_idx = 31, 32, 40
-
-            rate = row.get(rate_idx + offset, "")
-            daily = row.get(daily_idx + offset, "")
-            is_high_freq = rate in self.HIGH_FREQ_RATES or daily in self.HIGH_FREQ_DAILY
-            upload_report = row.get(upload_idx + offset, "")
-            # Required if high-freq but not uploading report (implying order-splitting exemption)
-            # Based on Excel comment: QFII investors using order-splitting to avoid high-freq extra reporting
-            return is_high_freq and upload_report == "否" and req_if_first_or_change(row)
-
-        # Field definitions (0-indexed to match CSV columns after header)
-        # Structure: (index, name_cn, name_en, max_length, required, conditional_required, valid_values, multi_value, max_multi_count)
-
-        if is_shenzhen:
-            # Shenzhen field definitions (38 fields with 序号 at position 0)
-            field_defs = [
-                # Shenzhen-specific: Sequence Number
-                (0, "序号", "sequence_num", 10, False, None, None, False, None),
-
-                # Basic Information (基本信息)
-                (1, "联交所参与者名称", "ep_name", 100, True, None, None, False, None),
-                (2, "经纪商代码", "broker_code", 5, True, None, None, False, None),
-                (3, "账户名称", "account_name", 200, True, None, None, False, None),
-                (4, "证件号码", "id_number", 80, False, req_if_first_or_change, None, False, None),
-                (5, "产品编码（选填）", "product_code", 50, False, None, None, False, None),
-                (6, "深市券商客户编码", "client_code", 10, True, None, None, False, None),
-                (7, "产品管理机构名称", "fund_manager", 200, False, None, None, False, None),
-                (8, "报告类型（首次/变更/停止使用）", "report_type", 6, True, None, self.REPORT_TYPES, False, None),
-                (9, "报告日期", "report_date", 8, True, None, None, False, None),
-
-                # Fund Information (资金信息)
-                (10, "是否选取一家联交所参与者集中填报资金信息", "consolidated_reporting", 1, False, req_if_first_or_change, self.YES_NO, False, None),
-                (11, "账户资金规模（人民币，万元）", "fund_size", 30, False, req_if_first_or_change, None, False, None),
-                (12, "账户资金来源", "fund_sources", 30, False, req_if_first_or_change, self.FUND_SOURCES, True, None),
-                # Note: Shenzhen doesn't have "其他资金来源描述" field (index 12 in Shanghai)
-                (13, "资金来源占比（%）", "fund_source_ratio", 50, False, req_if_first_or_change, None, False, None),
-                (14, "杠杆资金规模（人民币，万元）", "leverage_size", 30, False, req_if_first_or_change, None, False, None),
-                (15, "杠杆资金来源", "leverage_sources", 30, False, req_if_has_leverage, self.LEVERAGE_SOURCES, True, None),
-                # Note: Shenzhen doesn't have "其他杠杆资金来源描述" field (index 16 in Shanghai)
-                (16, "杠杆率（%）", "leverage_ratio", 20, False, req_if_first_or_change, None, False, None),
-
-                # Trading Information (交易信息)
-                (17, "交易品种", "trading_products", 20, False, req_if_first_or_change, self.TRADING_PRODUCTS, True, None),
-                (18, "是否量化交易", "is_quantitative", 1, False, req_if_first_or_change, self.YES_NO, False, None),
-                (19, "主策略类型", "main_strategy", 20, False, req_if_quantitative, self.STRATEGY_TYPES, False, None),
-                # Note: Shenzhen doesn't have "其他主策略类型" field (index 21 in Shanghai)
-                (20, "主策略概述", "main_strategy_desc", 500, False, req_if_main_strategy_filled, None, False, None),
-                (21, "辅策略类型", "sub_strategy", 50, False, None, self.STRATEGY_TYPES, True, 2),
-                # Note: Shenzhen doesn't have "其他辅策略类型" field (index 24 in Shanghai)
-                (22, "辅策略概述", "sub_strategy_desc", 500, False, req_if_sub_strategy_filled, None, False, None),
-                (23, "期货市场账户名称（选填）", "futures_account_name", 200, False, None, None, True, None),
-                (24, "期货市场账户代码（选填）", "futures_account_code", 300, False, None, None, True, None),
-                (25, "交易指令执行方式", "execution_method", 50, False, req_if_first_or_change, self.EXECUTION_METHODS, True, None),
-                # Note: Shenzhen doesn't have "其他方式描述" field (index 29 in Shanghai)
-                (26, "交易指令执行方式概述", "execution_desc", 500, False, req_if_first_or_change, None, False, None),
-                (27, "账户最高申报速率（笔/秒）", "max_order_rate", 20, False, req_if_first_or_change, self.ORDER_RATES, False, None),
-                (28, "账户单日最高申报笔数（笔）", "max_daily_orders", 20, False, req_if_first_or_change, self.DAILY_ORDER_COUNTS, False, None),
-
-                # Software Information (交易软件信息)
-                (29, "程序化交易软件名称及版本号", "software_name", 200, False, req_if_first_or_change, None, True, None),
-                (30, "程序化交易软件开发主体", "software_developer", 200, False, req_if_first_or_change, None, True, None),
-
-                # Other Information (其他)
-                (31, "高频交易系统服务器所在地", "hft_server_location", 100, False, req_if_high_freq_no_exempt, None, False, None),
-                (32, "联交所参与者联络人（选填）", "ep_contact", 80, False, None, None, False, None),
-                (33, "联系方式（选填）", "ep_contact_info", 80, False, None, None, False, None),
-                (34, "投资者相关业务负责人（选填）", "investor_contact", 80, False, None, None, False, None),
-                (35, "联系方式（选填）", "investor_contact_info", 80, False, None, None, False, None),
-                (36, "是否提交测试报告及应急方案", "upload_test_report", 5, False, req_if_first_or_change, self.YES_NO_EXEMPT, False, None),
-                (37, "合格境外投资者编码", "qfii_code", 50, False, req_if_qfii_exemption, None, False, None),
-            ]
-        else:
-            # Shanghai field definitions (42 fields, original)
-            field_defs = [
-                # Basic Information (基本信息)
-                (0, "联交所参与者名称", "ep_name", 100, True, None, None, False, None),
-                (1, "经纪商代码", "broker_code", 5, True, None, None, False, None),
-                (2, "账户名称", "account_name", 200, True, None, None, False, None),
-                (3, "证件号码", "id_number", 80, False, req_if_first_or_change, None, False, None),
-                (4, "产品编码（选填）", "product_code", 50, False, None, None, False, None),
-                (5, "券商客户编码", "client_code", 10, True, None, None, False, None),
-                (6, "产品管理机构名称", "fund_manager", 200, False, None, None, False, None),
-                (7, "报告类型", "report_type", 6, True, None, self.REPORT_TYPES, False, None),
-                (8, "报告日期", "report_date", 8, True, None, None, False, None),
-
-                # Fund Information (资金信息)
-                (9, "是否选取一家联交所参与者集中填报资金信息", "consolidated_reporting", 1, False, req_if_first_or_change, self.YES_NO, False, None),
-                (10, "账户资金规模（人民币，万元）", "fund_size", 30, False, req_if_first_or_change, None, False, None),
-                (11, "账户资金来源", "fund_sources", 30, False, req_if_first_or_change, self.FUND_SOURCES, True, None),
-                (12, "其他资金来源描述", "other_fund_desc", 200, False, req_if_fund_source_other, None, False, None),
-                (13, "资金来源占比", "fund_source_ratio", 50, False, req_if_first_or_change, None, False, None),
-                (14, "杠杆资金规模（人民币，万元）", "leverage_size", 30, False, req_if_first_or_change, None, False, None),
-                (15, "杠杆资金来源", "leverage_sources", 30, False, req_if_has_leverage, self.LEVERAGE_SOURCES, True, None),
-                (16, "其他杠杆资金来源描述", "other_leverage_desc", 200, False, req_if_leverage_source_other, None, False, None),
-                (17, "杠杆率（%）", "leverage_ratio", 20, False, req_if_first_or_change, None, False, None),
-
-                # Trading Information (交易信息)
-                (18, "交易品种", "trading_products", 20, False, req_if_first_or_change, self.TRADING_PRODUCTS, True, None),
-                (19, "是否量化交易", "is_quantitative", 1, False, req_if_first_or_change, self.YES_NO, False, None),
-                (20, "主策略类型", "main_strategy", 20, False, req_if_quantitative, self.STRATEGY_TYPES, False, None),
-                (21, "其他主策略类型", "other_main_strategy", 200, False, req_if_main_strategy_other, None, False, None),
-                (22, "主策略概述", "main_strategy_desc", 500, False, req_if_main_strategy_filled, None, False, None),
-                (23, "辅策略类型", "sub_strategy", 50, False, None, self.STRATEGY_TYPES, True, 2),
-                (24, "其他辅策略类型", "other_sub_strategy", 200, False, req_if_sub_strategy_other, None, False, None),
-                (25, "辅策略概述", "sub_strategy_desc", 500, False, req_if_sub_strategy_filled, None, False, None),
-                (26, "期货市场账户名称（选填）", "futures_account_name", 200, False, None, None, True, None),
-                (27, "期货市场账户代码（选填）", "futures_account_code", 300, False, None, None, True, None),
-                (28, "交易指令执行方式", "execution_method", 50, False, req_if_first_or_change, self.EXECUTION_METHODS, True, None),
-                (29, "其他方式描述", "other_execution_desc", 500, False, req_if_execution_other, None, False, None),
-                (30, "指令执行方式概述", "execution_desc", 500, False, req_if_first_or_change, None, False, None),
-                (31, "账户最高申报速率", "max_order_rate", 20, False, req_if_first_or_change, self.ORDER_RATES, False, None),
-                (32, "账户单日最高申报笔数", "max_daily_orders", 20, False, req_if_first_or_change, self.DAILY_ORDER_COUNTS, False, None),
-
-                # Software Information (交易软件信息)
-                (33, "程序化交易软件名称及版本号", "software_name", 200, False, req_if_first_or_change, None, True, None),
-                (34, "程序化交易软件开发主体", "software_developer", 200, False, req_if_first_or_change, None, True, None),
-
-                # Other Information (其他)
-                (35, "高频交易系统服务器所在地", "hft_server_location", 100, False, req_if_high_freq_no_exempt, None, False, None),
-                (36, "联交所参与者联络人（选填）", "ep_contact", 80, False, None, None, False, None),
-                (37, "联交所参与者联络人联系方式（选填）", "ep_contact_info", 80, False, None, None, False, None),
-                (38, "投资者相关业务负责人（选填）", "investor_contact", 80, False, None, None, False, None),
-                (39, "投资者相关业务负责人联系方式（选填）", "investor_contact_info", 80, False, None, None, False, None),
-                (40, "是否上传测试报告及应急方案", "upload_test_report", 5, False, req_if_first_or_change, self.YES_NO_EXEMPT, False, None),
-                (41, "合格境外投资者编码", "qfii_code", 50, False, req_if_qfii_exemption, None, False, None),
-            ]
-
-        for idx, name_cn, name_en, max_len, required, cond_req, valid_vals, multi, max_multi in field_defs:
-            specs[idx] = FieldSpec(
-                index=idx,
-                name_cn=name_cn,
-                name_en=name_en,
-                max_length=max_len,
-                required=required,
-                conditional_required=cond_req,
-                valid_values=valid_vals,
-                multi_value=multi,
-                max_multi_count=max_multi
-            )
-
+        specs, self._en_to_idx, self._cn_to_idx = _build_specs_cached(type(self), exchange_type)
+        self._field_checks = _build_field_checks(type(self), exchange_type)
+        self._row_state = _shenzhen_row_state if exchange_type == "SHENZHEN" else _shanghai_row_state
+        self._multi_value_messages = {}
+        self._set_hot_field_indices()
         return specs
 
+    def _set_hot_field_indices(self):
+        """Cache indices of fields used by the per-row validators (-1 if not present)"""
+        self._broker_code_idx = self._en_to_idx.get("broker_code", -1)
+        self._account_name_idx = self._en_to_idx.get("account_name", -1)
+        self._client_code_idx = self._en_to_idx.get("client_code", -1)
+        self._report_type_idx = self._en_to_idx.get("report_type", -1)
+        self._report_date_idx = self._en_to_idx.get("report_date", -1)
+        self._fund_size_idx = self._en_to_idx.get("fund_size", -1)
+        self._fund_sources_idx = self._en_to_idx.get("fund_sources", -1)
+        self._leverage_ratio_idx = self._en_to_idx.get("leverage_ratio", -1)
+        self._leverage_size_idx = self._en_to_idx.get("leverage_size", -1)
+        self._fund_source_ratio_idx = self._en_to_idx.get("fund_source_ratio", -1)
+        # (max_order_rate, max_daily_orders, hft_server_location, upload_test_report), or None
+        # when the exchange lacks any of them
+        hf_idx = tuple(self._en_to_idx.get(name, -1) for name in
+                       ("max_order_rate", "max_daily_orders", "hft_server_location", "upload_test_report"))
+        self._hf_idx = None if -1 in hf_idx else hf_idx
+        # Fields still required on a 停止使用 (stop) report
+        self._stop_required_idx = tuple(self._en_to_idx[name] for name in _STOP_REQUIRED_FIELDS
+                                        if name in self._en_to_idx)
+
     def add_error(self, row_num: int, field_name_cn: str, field_name_en: str, field_col: int,
                   value: str, message: str, severity: Severity = Severity.ERROR):
         """Add a validation error with complete field information"""
-        self.errors.append(ValidationError(
-            row_num=row_num,
-            field_name_cn=field_name_cn,
-            field_name_en=field_name_en,
-            field_col=field_col,
-            field_value=value,
-            message=message,
-            severity=severity,
-            account_name=self.current_row_context.get("account_name", ""),
-            client_code=self.current_row_context.get("client_code", "")
-        ))
+        self._append_error(row_num, self._field_key(field_name_cn, field_name_en, field_col), value, message, severity)
 
     def add_error_for_field(self, row_num: int, field_idx: int, value: str, message: str, severity: Severity = Severity.ERROR):
         """Add error using field index to look up field spec"""
-        spec = self.field_specs.get(field_idx)
-        if spec:
-            self.add_error(row_num, spec.name_cn, spec.name_en, field_idx + 1, value, message, severity)
+        if 0 <= field_idx < len(self.field_specs):
+            # Names are resolved from the spec when the record is formatted
+            self._append_error(row_num, field_idx, value, message, severity)
         else:
             # Fallback for fields without spec
             self.add_error(row_num, f"Field {field_idx + 1}", f"field_{field_idx}", field_idx + 1, value, message, severity)
 
     def get_field_idx_by_chinese_name(self, name_cn: str) -> int:
         """Get field index by Chinese field name"""
-        for idx, spec in self.field_specs.items():
-            if spec.name_cn == name_cn:
-                return idx
-        return -1  # Not found
+        return self._cn_to_idx.get(name_cn, -1)  # -1 if not found
 
     def _get_field_idx(self, field_en_name: str) -> int:
         """Get field index by English field name"""
-        for idx, spec in self.field_specs.items():
-            if spec.name_en == field_en_name:
-                return idx
-        return -1
+        return self._en_to_idx.get(field_en_name, -1)
 
     def validate_broker_code(self, row_num: int, value: str) -> bool:
         """Validate broker code is exactly 5 digits and matches filename FIRM_ID"""
         if not value:
             return True  # Handled by required check
 
-        broker_code_idx = self._get_field_idx("broker_code")
+        broker_code_idx = self._broker_code_idx
         if broker_code_idx == -1:
             return True
 
         # Check format (5 digits)
-        if not re.match(r'^\d{5}$', value):
+        if not _BROKER_RE.fullmatch(value):
             self.add_error_for_field(row_num, broker_code_idx, value, "Must be exactly 5 digits")
             return False
 
@@ -491,7 +771,7 @@ class SSEValidator:
         if not value:
             return True
 
-        client_code_idx = self._get_field_idx("client_code")
+        client_code_idx = self._client_code_idx
         if client_code_idx == -1:
             return True
 
@@ -505,15 +785,15 @@ class SSEValidator:
         if not value:
             return True
 
-        report_date_idx = self._get_field_idx("report_date")
+        report_date_idx = self._report_date_idx
         if report_date_idx == -1:
             return True
 
-        if not re.match(r'^\d{8}$', value):
+        if not _DATE_RE.fullmatch(value):
             self.add_error_for_field(row_num, report_date_idx, value, "Must be in YYYYMMDD format")
             return False
         try:
-            report_date = datetime.strptime(value, '%Y%m%d')
+            report_date = _parse_yyyymmdd(value)
             # Check that report date is not later than submission date (from filename)
             # Per HKEX spec: "第 n 行[报告日期]晚于上传日期" - Report date cannot be later than upload date
             if self.submission_date and report_date > self.submission_date:
@@ -534,12 +814,11 @@ class SSEValidator:
             if not allow_negative and num < 0:
                 self.add_error_for_field(row_num, field_idx, value, "Must be non-negative")
                 return False
-            # Check decimal places
-            if '.' in value:
-                decimals = len(value.split('.')[1])
-                if decimals > 2:
-                    self.add_error_for_field(row_num, field_idx, value, "Maximum 2 decimal places allowed")
-                    return False
+            # Check decimal places (float() accepted the value, so there is at most one '.')
+            dot = value.find('.')
+            if dot != -1 and len(value) - dot - 1 > 2:
+                self.add_error_for_field(row_num, field_idx, value, "Maximum 2 decimal places allowed")
+                return False
         except ValueError:
             self.add_error_for_field(row_num, field_idx, value, "Must be a valid number")
             return False
@@ -550,7 +829,7 @@ class SSEValidator:
         if not value or value == self.REPORTED_ELSEWHERE:
             return True
 
-        leverage_ratio_idx = self._get_field_idx("leverage_ratio")
+        leverage_ratio_idx = self._leverage_ratio_idx
         if leverage_ratio_idx == -1:
             return True
 
@@ -577,7 +856,7 @@ class SSEValidator:
         if not sources_value or sources_value == self.REPORTED_ELSEWHERE:
             return True
 
-        fund_source_ratio_idx = self._get_field_idx("fund_source_ratio")
+        fund_source_ratio_idx = self._fund_source_ratio_idx
         if fund_source_ratio_idx == -1:
             return True
 
@@ -585,19 +864,17 @@ class SSEValidator:
         sources = [s.strip() for s in sources_value.split(';') if s.strip()]
 
         # Parse ratios (format: "自有资金80%;募集资金20%")
-        ratio_pattern = r'([^;]+?)(\d+(?:\.\d+)?)\s*%'
-        matches = re.findall(ratio_pattern, ratio_value)
+        matches = _parse_ratios(ratio_value)
 
         if not matches:
             self.add_error_for_field(row_num, fund_source_ratio_idx, ratio_value,
                           "Invalid format. Expected: '来源1XX%;来源2XX%'")
             return False
 
-        ratio_sources = []
+        ratio_sources = set()
         total = 0
         for source, pct in matches:
-            source = source.strip()
-            ratio_sources.append(source)
+            ratio_sources.add(source.strip())
             total += float(pct)
 
         # Check sources match
@@ -620,7 +897,7 @@ class SSEValidator:
         if leverage_size == self.REPORTED_ELSEWHERE or fund_size == self.REPORTED_ELSEWHERE:
             return True
 
-        leverage_size_idx = self._get_field_idx("leverage_size")
+        leverage_size_idx = self._leverage_size_idx
         if leverage_size_idx == -1:
             return True
 
@@ -653,51 +930,67 @@ class SSEValidator:
         if not value or value == self.REPORTED_ELSEWHERE:
             return True
 
-        values = [v.strip() for v in value.split(';') if v.strip()]
+        # The verdict depends only on the field and the cell text, so each distinct value
+        # in a column is checked once per file
+        key = (field_spec.index, value)
+        message = self._multi_value_messages.get(key)
+        if message is None:
+            message = self._multi_value_messages[key] = self._multi_value_message(field_spec, value)
+        if message:
+            self.add_error_for_field(row_num, field_spec.index, value, message)
+            return False
+        return True
+
+    @staticmethod
+    def _multi_value_message(field_spec: FieldSpec, value: str) -> str:
+        """Return the error message for a non-empty multi-value cell, or "" if it is valid"""
+        # Single value: no split, duplicate or count checks needed
+        if ';' not in value:
+            v = value.strip()
+            if v and field_spec.valid_set is not None and v not in field_spec.valid_set:
+                return f"Invalid value '{v}'. Must be one of: {field_spec.valid_text}"
+            if '  ' in v:
+                return "Values must not contain leading/trailing spaces or line breaks"
+            return ""
+
+        # Strip each part once; empty parts (e.g. a trailing ';') are ignored
+        values = []
+        for v in value.split(';'):
+            v = v.strip()
+            if v:
+                values.append(v)
 
         # Check for duplicates
         if len(values) != len(set(values)):
-            self.add_error(row_num, field_spec.name_cn, field_spec.name_en, field_spec.index + 1,
-                          value, "Duplicate values not allowed")
-            return False
+            return "Duplicate values not allowed"
 
         # Check max count
         if field_spec.max_multi_count and len(values) > field_spec.max_multi_count:
-            self.add_error(row_num, field_spec.name_cn, field_spec.name_en, field_spec.index + 1,
-                          value, f"Maximum {field_spec.max_multi_count} values allowed")
-            return False
+            return f"Maximum {field_spec.max_multi_count} values allowed"
 
         # Check each value is valid (only if field has enumerated values)
         if field_spec.valid_values:
             for v in values:
-                if v not in field_spec.valid_values:
-                    self.add_error(row_num, field_spec.name_cn, field_spec.name_en, field_spec.index + 1,
-                                  value, f"Invalid value '{v}'. Must be one of: {', '.join(field_spec.valid_values)}")
-                    return False
+                if v not in field_spec.valid_set:
+                    return f"Invalid value '{v}'. Must be one of: {field_spec.valid_text}"
 
-        # Check for whitespace in values
+        # Check for whitespace in values (each value is already stripped)
         for v in values:
-            if v != v.strip() or '  ' in v:
-                self.add_error(row_num, field_spec.name_cn, field_spec.name_en, field_spec.index + 1,
-                              value, "Values must not contain leading/trailing spaces or line breaks")
-                return False
+            if '  ' in v:
+                return "Values must not contain leading/trailing spaces or line breaks"
 
-        return True
+        return ""
 
-    def validate_high_freq_requirements(self, row_num: int, row: dict) -> bool:
+    def validate_high_freq_requirements(self, row_num: int, cells: list) -> bool:
         """Validate high-frequency trading requirements"""
-        rate_idx = self._get_field_idx("max_order_rate")
-        daily_idx = self._get_field_idx("max_daily_orders")
-        server_idx = self._get_field_idx("hft_server_location")
-        upload_idx = self._get_field_idx("upload_test_report")
-
-        if rate_idx == -1 or daily_idx == -1 or server_idx == -1 or upload_idx == -1:
+        if self._hf_idx is None:
             return True
+        rate_idx, daily_idx, server_idx, upload_idx = self._hf_idx
 
-        rate = row.get(rate_idx, "")
-        daily = row.get(daily_idx, "")
-        server_location = row.get(server_idx, "")
-        upload_report = row.get(upload_idx, "")
+        rate = cells[rate_idx]
+        daily = cells[daily_idx]
+        server_location = cells[server_idx]
+        upload_report = cells[upload_idx]
 
         is_high_freq = rate in self.HIGH_FREQ_RATES or daily in self.HIGH_FREQ_DAILY
 
@@ -722,119 +1015,121 @@ class SSEValidator:
         # Determine max columns based on exchange type (Shenzhen has 38, Shanghai has 42)
         max_cols = 38 if self.exchange_type == "SHENZHEN" else 42
 
-        # Build row dict for easier access
-        row = {i: (row_data[i].strip() if i < len(row_data) else "") for i in range(max_cols)}
+        # Stripped cells, padded to the exchange's column count
+        cells = [c.strip() for c in row_data[:max_cols]]
+        if len(cells) < max_cols:
+            cells.extend([""] * (max_cols - len(cells)))
 
-        # Get field indices dynamically based on exchange type
-        account_name_idx = self._get_field_idx("account_name")
-        client_code_idx = self._get_field_idx("client_code")
-        report_type_idx = self._get_field_idx("report_type")
-        ep_name_idx = self._get_field_idx("ep_name")
-        broker_code_idx = self._get_field_idx("broker_code")
-        report_date_idx = self._get_field_idx("report_date")
+        # Field indices for this exchange (cached by _build_field_specs)
+        account_name_idx = self._account_name_idx
+        client_code_idx = self._client_code_idx
+        report_type_idx = self._report_type_idx
+        broker_code_idx = self._broker_code_idx
+        report_date_idx = self._report_date_idx
+
+        # Cells read by more than one check below are fetched once per row
+        client_val = cells[client_code_idx] if client_code_idx != -1 else ""
 
         # Set current row context for error messages
-        self.current_row_context = {
-            "account_name": row.get(account_name_idx, "") if account_name_idx != -1 else "",
-            "client_code": row.get(client_code_idx, "") if client_code_idx != -1 else ""
-        }
+        self._set_row_context(
+            cells[account_name_idx] if account_name_idx != -1 else "",
+            client_val
+        )
 
         valid = True
-        report_type = row.get(report_type_idx, "") if report_type_idx != -1 else ""
+        report_type = cells[report_type_idx] if report_type_idx != -1 else ""
         is_stop = report_type == "停止使用"
 
         # For "停止使用", only basic fields required
         if is_stop:
-            required_field_names = ["ep_name", "broker_code", "account_name", "client_code", "report_date"]
-            for field_name in required_field_names:
-                idx = self._get_field_idx(field_name)
-                spec = self.field_specs.get(idx) if idx != -1 else None
-                if spec and not row.get(idx, ""):
-                    self.add_error(row_num, spec.name_cn, spec.name_en, spec.index + 1, "", "Required field")
+            for idx in self._stop_required_idx:
+                if not cells[idx]:
+                    self.add_error_for_field(row_num, idx, "", "Required field")
                     valid = False
             return valid
 
+        # Facts shared by the conditional requirements and leverage checks
+        first_or_change = report_type in _FIRST_OR_CHANGE
+        fund_sources_idx = self._fund_sources_idx
+        fund_sources_val = cells[fund_sources_idx] if fund_sources_idx != -1 else ""
+        has_leverage = "杠杆资金" in fund_sources_val
+
         # Validate each field
-        for idx, spec in self.field_specs.items():
-            value = row.get(idx, "")
+        state = -1  # Row state bits, computed on the first empty conditionally-required field
+        for idx, spec, max_length, required, req_mask, req_bits, multi_value, valid_set, enum_message in self._field_checks:
+            value = cells[idx]
+
+            # Check required (only an empty value can fail it), then skip further validation
+            if not value:
+                if not required and req_mask:
+                    if state < 0:
+                        state = self._row_state(cells, first_or_change, has_leverage)
+                    required = (state & req_mask) == req_bits
+                if required:
+                    self.add_error_for_field(row_num, idx, "", "Required field")
+                    valid = False
+                continue
 
             # Check length
-            if value and len(value) > spec.max_length:
+            if len(value) > max_length:
                 display_value = value[:50] + "..." if len(value) > 50 else value
-                self.add_error(row_num, spec.name_cn, spec.name_en, spec.index + 1, display_value,
-                              f"Exceeds maximum length of {spec.max_length}")
+                self.add_error_for_field(row_num, idx, display_value,
+                              f"Exceeds maximum length of {max_length}")
                 valid = False
 
-            # Check required
-            is_required = spec.required
-            if spec.conditional_required:
-                is_required = is_required or spec.conditional_required(row)
-
-            if is_required and not value:
-                self.add_error(row_num, spec.name_cn, spec.name_en, spec.index + 1, "", "Required field")
-                valid = False
-                continue
-
-            # Skip further validation if empty
-            if not value:
-                continue
-
             # Check multi-value fields
-            if spec.multi_value:
+            if multi_value:
                 if not self.validate_multi_value_field(row_num, spec, value):
                     valid = False
             # Check enumerated values (for non-multi-value fields)
-            elif spec.valid_values:
-                if value not in spec.valid_values and value != self.REPORTED_ELSEWHERE:
-                    self.add_error(row_num, spec.name_cn, spec.name_en, spec.index + 1, value,
-                                  f"Must be one of: {', '.join(spec.valid_values)}")
+            elif valid_set is not None:
+                if value not in valid_set and value != self.REPORTED_ELSEWHERE:
+                    self.add_error_for_field(row_num, idx, value, enum_message)
                     valid = False
 
         # Field-specific validations using dynamic lookup
-        broker_val = row.get(broker_code_idx, "") if broker_code_idx != -1 else ""
+        broker_val = cells[broker_code_idx] if broker_code_idx != -1 else ""
         if not self.validate_broker_code(row_num, broker_val):
             valid = False
 
-        client_val = row.get(client_code_idx, "") if client_code_idx != -1 else ""
         if not self.validate_client_code(row_num, client_val):
             valid = False
 
-        date_val = row.get(report_date_idx, "") if report_date_idx != -1 else ""
+        date_val = cells[report_date_idx] if report_date_idx != -1 else ""
         if not self.validate_date(row_num, date_val):
             valid = False
 
         # Numeric validations
-        fund_size_idx = self._get_field_idx("fund_size")
+        fund_size_idx = self._fund_size_idx
+        fund_size_val = cells[fund_size_idx] if fund_size_idx != -1 else ""
         if fund_size_idx != -1:
-            if not self.validate_numeric(row_num, fund_size_idx, row.get(fund_size_idx, "")):
+            if not self.validate_numeric(row_num, fund_size_idx, fund_size_val):
                 valid = False
 
-        leverage_size_idx = self._get_field_idx("leverage_size")
+        leverage_size_idx = self._leverage_size_idx
+        leverage_size_val = cells[leverage_size_idx] if leverage_size_idx != -1 else ""
         if leverage_size_idx != -1:
-            if not self.validate_numeric(row_num, leverage_size_idx, row.get(leverage_size_idx, "")):
+            if not self.validate_numeric(row_num, leverage_size_idx, leverage_size_val):
                 valid = False
 
         # Leverage-related validations
-        fund_sources_idx = self._get_field_idx("fund_sources")
-        has_leverage = "杠杆资金" in row.get(fund_sources_idx, "") if fund_sources_idx != -1 else False
-
-        leverage_ratio_idx = self._get_field_idx("leverage_ratio")
+        leverage_ratio_idx = self._leverage_ratio_idx
         if leverage_ratio_idx != -1:
-            if not self.validate_leverage_ratio(row_num, row.get(leverage_ratio_idx, ""), has_leverage):
+            if not self.validate_leverage_ratio(row_num, cells[leverage_ratio_idx], has_leverage):
                 valid = False
 
         if fund_size_idx != -1 and leverage_size_idx != -1:
-            if not self.validate_leverage_funds(row_num, row.get(leverage_size_idx, ""), row.get(fund_size_idx, ""), has_leverage):
+            if not self.validate_leverage_funds(row_num, leverage_size_val, fund_size_val, has_leverage):
                 valid = False
 
         # Fund source ratio validation
-        fund_source_ratio_idx = self._get_field_idx("fund_source_ratio")
+        fund_source_ratio_idx = self._fund_source_ratio_idx
         if fund_source_ratio_idx != -1 and fund_sources_idx != -1:
-            if not self.validate_fund_source_ratio(row_num, row.get(fund_source_ratio_idx, ""), row.get(fund_sources_idx, "")):
+            if not self.validate_fund_source_ratio(row_num, cells[fund_source_ratio_idx], fund_sources_val):
                 valid = False
 
         # High-frequency trading validations
-        if not self.validate_high_freq_requirements(row_num, row):
+        if not self.validate_high_freq_requirements(row_num, cells):
             valid = False
 
         return valid
@@ -846,26 +1141,54 @@ class SSEValidator:
             file_path: Path to the Excel file to validate
             original_filename: Optional original filename (used when file_path is a temp file)
         """
-        self.errors = []
+        self._reset_errors()
         path = Path(file_path)
 
         if not path.exists():
             self.add_error(0, "File", "file", 0, str(file_path), "File not found")
-            return False, self.errors
+            return False, list(self.iter_errors())
 
         # Only support Excel files
         if path.suffix.lower() != '.xlsx':
             self.add_error(0, "File", "file", 0, str(file_path), "Only Excel files (.xlsx) are supported")
-            return False, self.errors
+            return False, list(self.iter_errors())
 
         # Detect exchange type, submission date, and firm ID from filename
         # Use original filename if provided (for uploaded files), otherwise use actual file path
         filename = original_filename if original_filename else path.name
+        return self._validate_workbook(file_path, str(file_path), filename)
+
+    def validate_file_bytes(self, data: Union[bytes, BinaryIO], original_filename: str) -> tuple[bool, list[ValidationError]]:
+        """Validate an Excel file held in memory (e.g. an upload), without writing it to disk
+
+        Args:
+            data: File contents, as bytes or a binary file-like object
+            original_filename: Name of the uploaded file (used for extension and exchange detection)
+        """
+        self._reset_errors()
+
+        # Only support Excel files
+        if Path(original_filename).suffix.lower() != '.xlsx':
+            self.add_error(0, "File", "file", 0, original_filename, "Only Excel files (.xlsx) are supported")
+            return False, list(self.iter_errors())
+
+        if isinstance(data, (bytes, bytearray)):
+            data = BytesIO(data)
+        return self._validate_workbook(data, original_filename, original_filename)
+
+    def _validate_workbook(self, source, source_name: str, filename: str) -> tuple[bool, list[ValidationError]]:
+        """Validate a workbook given as a path or binary file-like object
+
+        Args:
+            source: Path or binary file-like object to read the workbook from
+            source_name: Shown as the value of file-level errors
+            filename: Filename used to detect exchange type, submission date and firm ID
+        """
         exchange_type, submission_date, firm_id, filename_error = self.detect_exchange(filename)
 
         if filename_error:
             self.add_error(0, "Filename", "filename", 0, filename, filename_error)
-            return False, self.errors
+            return False, list(self.iter_errors())
 
         self.exchange_type = exchange_type
         self.submission_date = submission_date
@@ -875,112 +1198,148 @@ class SSEValidator:
         self.field_specs = self._build_field_specs(exchange_type)
 
         # Read Excel data
-        rows = self._read_xlsx(file_path)
+        rows = self._read_xlsx(source, source_name)
 
         if not rows:
-            self.add_error(0, "File", "file", 0, str(file_path), "No data rows found")
-            return False, self.errors
+            self.add_error(0, "File", "file", 0, source_name, "No data rows found")
+            return False, list(self.iter_errors())
 
         # Track client codes for duplicate check
         client_codes = {}
+        client_code_idx = self._client_code_idx
+
+        # (account_name, client_code) per row, for the row results built after the loop
+        row_contexts = []
 
         # Validate each row
         for row_num, row_data in enumerate(rows, start=1):
-            # Track errors before validation
-            errors_before = len([e for e in self.errors if e.severity == Severity.ERROR and e.row_num == row_num])
-            warnings_before = len([e for e in self.errors if e.severity == Severity.WARNING and e.row_num == row_num])
-
             self.validate_row(row_num, row_data)
 
-            # Check for duplicate client codes using dynamic index
-            client_code_idx = self._get_field_idx("client_code")
-            account_name_idx = self._get_field_idx("account_name")
-
-            if client_code_idx != -1 and len(row_data) > client_code_idx:
-                client_code = row_data[client_code_idx].strip() if row_data[client_code_idx] else ""
-                if client_code:
-                    if client_code in client_codes:
-                        self.add_error_for_field(row_num, client_code_idx, client_code,
-                                      f"Duplicate client code (first occurrence: row {client_codes[client_code]})")
-                    else:
-                        client_codes[client_code] = row_num
-
-            # Track errors after validation
-            errors_after = len([e for e in self.errors if e.severity == Severity.ERROR and e.row_num == row_num])
-            warnings_after = len([e for e in self.errors if e.severity == Severity.WARNING and e.row_num == row_num])
-
-            # Record row result
-            account_name = row_data[account_name_idx].strip() if account_name_idx != -1 and len(row_data) > account_name_idx else ""
-            client_code = row_data[client_code_idx].strip() if client_code_idx != -1 and len(row_data) > client_code_idx else ""
-            error_count = errors_after - errors_before
-            warning_count = warnings_after - warnings_before
-
-            self.row_results.append(RowValidationResult(
+            # validate_row set the row context to the row's stripped account name and client code
+            client_code = self._ctx_client
+            row_contexts.append((self._ctx_account, client_code))
+
+            # Check for duplicate client codes
+            if client_code:
+                first_row = client_codes.setdefault(client_code, row_num)
+                if first_row != row_num:
+                    self.add_error_for_field(row_num, client_code_idx, client_code,
+                                  f"Duplicate client code (first occurrence: row {first_row})")
+
+        # Record row results from per-row error and warning counts
+        error_counts = Counter()
+        warning_counts = Counter()
+        for row_num, severity in zip(self._err_row, self._err_sev):
+            if severity == _ERROR_CODE:
+                error_counts[row_num] += 1
+            else:
+                warning_counts[row_num] += 1
+        self.row_results.extend(
+            RowValidationResult(
                 row_num=row_num,
                 account_name=account_name,
                 client_code=client_code,
-                is_valid=(error_count == 0),
-                error_count=error_count,
-                warning_count=warning_count
-            ))
+                is_valid=(error_counts[row_num] == 0),
+                error_count=error_counts[row_num],
+                warning_count=warning_counts[row_num]
+            )
+            for row_num, (account_name, client_code) in enumerate(row_contexts, start=1)
+        )
+
+        return _ERROR_CODE not in self._err_sev, list(self.iter_errors())
+
+    def _read_xlsx(self, source, source_name: str) -> list[list[str]]:
+        """Read data from an Excel file (path or binary file-like), skipping any instructional text above the header"""
+        # Determine number of columns based on exchange type
+        # Shenzhen: 38 columns, Shanghai: 42 columns
+        max_cols = 38 if self.exchange_type == "SHENZHEN" else 42
 
-        return len([e for e in self.errors if e.severity == Severity.ERROR]) == 0, self.errors
+        # python-calamine (optional) parses the workbook in native code, much faster than openpyxl
+        sheet_rows = _read_first_sheet_calamine(source)
+        if sheet_rows is not None:
+            return self._read_sheet_rows(map(_calamine_row, sheet_rows), max_cols, source_name)
+        if hasattr(source, "seek"):
+            source.seek(0)  # calamine may have consumed the stream
 
-    def _read_xlsx(self, file_path: str) -> list[list[str]]:
-        """Read data from Excel file, skipping any instructional text above the header"""
         try:
             from openpyxl import load_workbook
-            wb = load_workbook(file_path, data_only=True)
-            ws = wb.active
-
-            # Find header row (look for "联交所参与者名称" or "序号" for Shenzhen)
-            # Search up to row 30 to handle files with instructions/text above the data
-            header_row = None
-            for row_idx in range(1, min(30, ws.max_row + 1)):
-                for col_idx in range(1, min(10, ws.max_column + 1)):
-                    cell_val = ws.cell(row=row_idx, column=col_idx).value
-                    # For Shenzhen, first column is 序号, second is 联交所参与者名称
-                    # For Shanghai, first column is 联交所参与者名称
-                    if cell_val and "联交所参与者名称" in str(cell_val):
-                        header_row = row_idx
-                        self.header_row = header_row  # Store for reference
-                        break
-                if header_row:
-                    break
-
-            if not header_row:
-                self.add_error(0, "File", "file", 0, file_path,
-                              "Could not find header row with '联交所参与者名称'. Please ensure the Excel file contains the correct header row.")
-                return []
-
-            # Determine number of columns based on exchange type
-            # Shenzhen: 38 columns, Shanghai: 42 columns
-            max_cols = 39 if self.exchange_type == "SHENZHEN" else 43  # +1 for 1-based Excel indexing
-
-            # Read data rows (skip header row and any empty rows)
-            rows = []
-            for row_idx in range(header_row + 1, ws.max_row + 1):
-                row_data = []
-                has_data = False
-                for col_idx in range(1, max_cols):
-                    cell = ws.cell(row=row_idx, column=col_idx)
-                    val = str(cell.value) if cell.value is not None else ""
-                    row_data.append(val)
-                    if val and val != "None":
-                        has_data = True
-                if has_data:
-                    rows.append(row_data)
-
-            return rows
+            # Read-only mode streams rows instead of building every Cell object up front
+            wb = load_workbook(source, read_only=True, data_only=True)
+            try:
+                ws = wb.active
+                # The stored sheet dimensions may be missing or stale; scan the actual rows instead
+                ws.reset_dimensions()
+                return self._read_sheet_rows(ws.iter_rows(max_col=max_cols, values_only=True), max_cols, source_name)
+            finally:
+                wb.close()
 
         except ImportError:
-            self.add_error(0, "File", "file", 0, file_path,
+            self.add_error(0, "File", "file", 0, source_name,
                           "openpyxl library required for Excel files. Install with: pip install openpyxl")
             return []
         except Exception as e:
-            self.add_error(0, "File", "file", 0, file_path, f"Error reading Excel file: {str(e)}")
+            self.add_error(0, "File", "file", 0, source_name, f"Error reading Excel file: {str(e)}")
+            return []
+
+    def _read_sheet_rows(self, sheet_rows, max_cols: int, source_name: str) -> list[list[str]]:
+        """Locate the header row in a sheet's row values (from row 1) and return the data rows below it as strings"""
+        sheet_rows = iter(sheet_rows)
+
+        # Find header row (look for "联交所参与者名称" or "序号" for Shenzhen)
+        # Search up to row 30 to handle files with instructions/text above the data
+        header_row = None
+        for row_idx, row_values in enumerate(islice(sheet_rows, 29), start=1):
+            for cell_val in row_values[:9]:
+                # For Shenzhen, first column is 序号, second is 联交所参与者名称
+                # For Shanghai, first column is 联交所参与者名称
+                if cell_val and "联交所参与者名称" in str(cell_val):
+                    header_row = row_idx
+                    self.header_row = header_row  # Store for reference
+                    break
+            if header_row:
+                break
+
+        if not header_row:
+            self.add_error(0, "File", "file", 0, source_name,
+                          "Could not find header row with '联交所参与者名称'. Please ensure the Excel file contains the correct header row.")
             return []
 
+        # Repeated cell values share one string object through `dedup`, which lives for this
+        # file only. It starts with the enumerated values, so a valid enum cell becomes the
+        # FieldSpec.valid_set member itself (membership tests then hit the identity fast path).
+        # Nothing read from the file is interned: free text, client codes, IDs and names can
+        # hold any number of distinct values and must not outlive the file.
+        dedup: dict[str, str] = {value: value for spec in self.field_specs if spec.valid_set
+                                 for value in spec.valid_set}
+
+        # Read data rows (skip header row and any empty rows)
+        rows = []
+        # The header scan stopped right after the header row, so the iterator continues from the data
+        for row_values in sheet_rows:
+            row_data = ["" if cell_val is None else str(cell_val) for cell_val in row_values[:max_cols]]
+            if any(val and val != "None" for val in row_data):
+                row_data = [dedup.setdefault(val, val) for val in row_data]
+                if len(row_data) < max_cols:
+                    row_data.extend([""] * (max_cols - len(row_data)))
+                rows.append(row_data)
+
+        return rows
+
+    @staticmethod
+    def _format_valid_row(result: RowValidationResult) -> str:
+        """Format a report line for a row that passed validation"""
+        context_parts = []
+        if result.account_name:
+            context_parts.append(result.account_name)
+        if result.client_code:
+            context_parts.append(f"BCAN: {result.client_code}")
+        context = " - ".join(context_parts) if context_parts else "Row data"
+
+        msg = f"✓ Row {result.row_num}: {context}"
+        if result.warning_count > 0:
+            msg += f" (with {result.warning_count} warning(s))"
+        return msg
+
     def generate_report(self) -> str:
         """Generate a validation report"""
         lines = []
@@ -1008,12 +1367,13 @@ class SSEValidator:
         if self.exchange_type or self.firm_id or self.submission_date:
             lines.append("")
 
-        errors = [e for e in self.errors if e.severity == Severity.ERROR]
-        warnings = [e for e in self.errors if e.severity == Severity.WARNING]
+        severities = self._err_sev
+        errors = [i for i, s in enumerate(severities) if s == _ERROR_CODE]
+        warnings = [i for i, s in enumerate(severities) if s == _WARNING_CODE]
 
         # Summary
         total_rows = len(self.row_results)
-        valid_rows = len([r for r in self.row_results if r.is_valid])
+        valid_rows = sum(1 for r in self.row_results if r.is_valid)
         invalid_rows = total_rows - valid_rows
 
         lines.append(f"Total Rows Processed: {total_rows}")
@@ -1025,38 +1385,18 @@ class SSEValidator:
 
         # Successful validations
         if valid_rows > 0:
-            lines.append("-" * 80)
-            lines.append("SUCCESSFUL VALIDATIONS:")
-            lines.append("-" * 80)
-            for result in self.row_results:
-                if result.is_valid:
-                    context_parts = []
-                    if result.account_name:
-                        context_parts.append(result.account_name)
-                    if result.client_code:
-                        context_parts.append(f"BCAN: {result.client_code}")
-                    context = " - ".join(context_parts) if context_parts else "Row data"
-
-                    msg = f"✓ Row {result.row_num}: {context}"
-                    if result.warning_count > 0:
-                        msg += f" (with {result.warning_count} warning(s))"
-                    lines.append(msg)
+            lines.extend(("-" * 80, "SUCCESSFUL VALIDATIONS:", "-" * 80))
+            lines.extend(self._format_valid_row(result) for result in self.row_results if result.is_valid)
             lines.append("")
 
         if errors:
-            lines.append("-" * 80)
-            lines.append("ERRORS:")
-            lines.append("-" * 80)
-            for e in errors:
-                lines.append(str(e))
+            lines.extend(("-" * 80, "ERRORS:", "-" * 80))
+            lines.extend(map(self.format_error, errors))
             lines.append("")
 
         if warnings:
-            lines.append("-" * 80)
-            lines.append("WARNINGS:")
-            lines.append("-" * 80)
-            for w in warnings:
-                lines.append(str(w))
+            lines.extend(("-" * 80, "WARNINGS:", "-" * 80))
+            lines.extend(map(self.format_error, warnings))
             lines.append("")
 
         if not errors and not warnings:
@@ -1067,6 +1407,183 @@ class SSEValidator:
         return "\n".join(lines)
 
 
+# Field definitions (0-indexed to match CSV columns after header)
+# Structure: (index, name_cn, name_en, max_length, required, condition, valid_values, multi_value, max_multi_count)
+# condition is a (req_mask, req_bits) pair from _CONDITIONS, or None
+# valid_values names the SSEValidator class attribute holding the enumerated values, so
+# subclasses can override them; it is resolved when the specs are built for a class
+
+# Shenzhen field definitions (38 fields with 序号 at position 0)
+_SHENZHEN_FIELD_DEFS = (
+    # Shenzhen-specific: Sequence Number
+    (0, "序号", "sequence_num", 10, False, None, None, False, None),
+
+    # Basic Information (基本信息)
+    (1, "联交所参与者名称", "ep_name", 100, True, None, None, False, None),
+    (2, "经纪商代码", "broker_code", 5, True, None, None, False, None),
+    (3, "账户名称", "account_name", 200, True, None, None, False, None),
+    (4, "证件号码", "id_number", 80, False, _CONDITIONS["first_or_change"], None, False, None),
+    (5, "产品编码（选填）", "product_code", 50, False, None, None, False, None),
+    (6, "深市券商客户编码", "client_code", 10, True, None, None, False, None),
+    (7, "产品管理机构名称", "fund_manager", 200, False, None, None, False, None),
+    (8, "报告类型（首次/变更/停止使用）", "report_type", 6, True, None, "REPORT_TYPES", False, None),
+    (9, "报告日期", "report_date", 8, True, None, None, False, None),
+
+    # Fund Information (资金信息)
+    (10, "是否选取一家联交所参与者集中填报资金信息", "consolidated_reporting", 1, False, _CONDITIONS["first_or_change"], "YES_NO", False, None),
+    (11, "账户资金规模（人民币，万元）", "fund_size", 30, False, _CONDITIONS["first_or_change"], None, False, None),
+    (12, "账户资金来源", "fund_sources", 30, False, _CONDITIONS["first_or_change"], "FUND_SOURCES", True, None),
+    # Note: Shenzhen doesn't have "其他资金来源描述" field (index 12 in Shanghai)
+    (13, "资金来源占比（%）", "fund_source_ratio", 50, False, _CONDITIONS["first_or_change"], None, False, None),
+    (14, "杠杆资金规模（人民币，万元）", "leverage_size", 30, False, _CONDITIONS["first_or_change"], None, False, None),
+    (15, "杠杆资金来源", "leverage_sources", 30, False, _CONDITIONS["has_leverage"], "LEVERAGE_SOURCES", True, None),
+    # Note: Shenzhen doesn't have "其他杠杆资金来源描述" field (index 16 in Shanghai)
+    (16, "杠杆率（%）", "leverage_ratio", 20, False, _CONDITIONS["first_or_change"], None, False, None),
+
+    # Trading Information (交易信息)
+    (17, "交易品种", "trading_products", 20, False, _CONDITIONS["first_or_change"], "TRADING_PRODUCTS", True, None),
+    (18, "是否量化交易", "is_quantitative", 1, False, _CONDITIONS["first_or_change"], "YES_NO", False, None),
+    (19, "主策略类型", "main_strategy", 20, False, _CONDITIONS["quantitative"], "STRATEGY_TYPES", False, None),
+    # Note: Shenzhen doesn't have "其他主策略类型" field (index 21 in Shanghai)
+    (20, "主策略概述", "main_strategy_desc", 500, False, _CONDITIONS["main_strategy_filled"], None, False, None),
+    (21, "辅策略类型", "sub_strategy", 50, False, None, "STRATEGY_TYPES", True, 2),
+    # Note: Shenzhen doesn't have "其他辅策略类型" field (index 24 in Shanghai)
+    (22, "辅策略概述", "sub_strategy_desc", 500, False, _CONDITIONS["sub_strategy_filled"], None, False, None),
+    (23, "期货市场账户名称（选填）", "futures_account_name", 200, False, None, None, True, None),
+    (24, "期货市场账户代码（选填）", "futures_account_code", 300, False, None, None, True, None),
+    (25, "交易指令执行方式", "execution_method", 50, False, _CONDITIONS["first_or_change"], "EXECUTION_METHODS", True, None),
+    # Note: Shenzhen doesn't have "其他方式描述" field (index 29 in Shanghai)
+    (26, "交易指令执行方式概述", "execution_desc", 500, False, _CONDITIONS["first_or_change"], None, False, None),
+    (27, "账户最高申报速率（笔/秒）", "max_order_rate", 20, False, _CONDITIONS["first_or_change"], "ORDER_RATES", False, None),
+    (28, "账户单日最高申报笔数（笔）", "max_daily_orders", 20, False, _CONDITIONS["first_or_change"], "DAILY_ORDER_COUNTS", False, None),
+
+    # Software Information (交易软件信息)
+    (29, "程序化交易软件名称及版本号", "software_name", 200, False, _CONDITIONS["first_or_change"], None, True, None),
+    (30, "程序化交易软件开发主体", "software_developer", 200, False, _CONDITIONS["first_or_change"], None, True, None),
+
+    # Other Information (其他)
+    (31, "高频交易系统服务器所在地", "hft_server_location", 100, False, _CONDITIONS["high_freq_no_exempt"], None, False, None),
+    (32, "联交所参与者联络人（选填）", "ep_contact", 80, False, None, None, False, None),
+    (33, "联系方式（选填）", "ep_contact_info", 80, False, None, None, False, None),
+    (34, "投资者相关业务负责人（选填）", "investor_contact", 80, False, None, None, False, None),
+    (35, "联系方式（选填）", "investor_contact_info", 80, False, None, None, False, None),
+    (36, "是否提交测试报告及应急方案", "upload_test_report", 5, False, _CONDITIONS["first_or_change"], "YES_NO_EXEMPT", False, None),
+    (37, "合格境外投资者编码", "qfii_code", 50, False, _CONDITIONS["qfii_exemption"], None, False, None),
+)
+
+# Shanghai field definitions (42 fields, original)
+_SHANGHAI_FIELD_DEFS = (
+    # Basic Information (基本信息)
+    (0, "联交所参与者名称", "ep_name", 100, True, None, None, False, None),
+    (1, "经纪商代码", "broker_code", 5, True, None, None, False, None),
+    (2, "账户名称", "account_name", 200, True, None, None, False, None),
+    (3, "证件号码", "id_number", 80, False, _CONDITIONS["first_or_change"], None, False, None),
+    (4, "产品编码（选填）", "product_code", 50, False, None, None, False, None),
+    (5, "券商客户编码", "client_code", 10, True, None, None, False, None),
+    (6, "产品管理机构名称", "fund_manager", 200, False, None, None, False, None),
+    (7, "报告类型", "report_type", 6, True, None, "REPORT_TYPES", False, None),
+    (8, "报告日期", "report_date", 8, True, None, None, False, None),
+
+    # Fund Information (资金信息)
+    (9, "是否选取一家联交所参与者集中填报资金信息", "consolidated_reporting", 1, False, _CONDITIONS["first_or_change"], "YES_NO", False, None),
+    (10, "账户资金规模（人民币，万元）", "fund_size", 30, False, _CONDITIONS["first_or_change"], None, False, None),
+    (11, "账户资金来源", "fund_sources", 30, False, _CONDITIONS["first_or_change"], "FUND_SOURCES", True, None),
+    (12, "其他资金来源描述", "other_fund_desc", 200, False, _CONDITIONS["fund_source_other"], None, False, None),
+    (13, "资金来源占比", "fund_source_ratio", 50, False, _CONDITIONS["first_or_change"], None, False, None),
+    (14, "杠杆资金规模（人民币，万元）", "leverage_size", 30, False, _CONDITIONS["first_or_change"], None, False, None),
+    (15, "杠杆资金来源", "leverage_sources", 30, False, _CONDITIONS["has_leverage"], "LEVERAGE_SOURCES", True, None),
+    (16, "其他杠杆资金来源描述", "other_leverage_desc", 200, False, _CONDITIONS["leverage_source_other"], None, False, None),
+    (17, "杠杆率（%）", "leverage_ratio", 20, False, _CONDITIONS["first_or_change"], None, False, None),
+
+    # Trading Information (交易信息)
+    (18, "交易品种", "trading_products", 20, False, _CONDITIONS["first_or_change"], "TRADING_PRODUCTS", True, None),
+    (19, "是否量化交易", "is_quantitative", 1, False, _CONDITIONS["first_or_change"], "YES_NO", False, None),
+    (20, "主策略类型", "main_strategy", 20, False, _CONDITIONS["quantitative"], "STRATEGY_TYPES", False, None),
+    (21, "其他主策略类型", "other_main_strategy", 200, False, _CONDITIONS["main_strategy_other"], None, False, None),
+    (22, "主策略概述", "main_strategy_desc", 500, False, _CONDITIONS["main_strategy_filled"], None, False, None),
+    (23, "辅策略类型", "sub_strategy", 50, False, None, "STRATEGY_TYPES", True, 2),
+    (24, "其他辅策略类型", "other_sub_strategy", 200, False, _CONDITIONS["sub_strategy_other"], None, False, None),
+    (25, "辅策略概述", "sub_strategy_desc", 500, False, _CONDITIONS["sub_strategy_filled"], None, False, None),
+    (26, "期货市场账户名称（选填）", "futures_account_name", 200, False, None, None, True, None),
+    (27, "期货市场账户代码（选填）", "futures_account_code", 300, False, None, None, True, None),
+    (28, "交易指令执行方式", "execution_method", 50, False, _CONDITIONS["first_or_change"], "EXECUTION_METHODS", True, None),
+    (29, "其他方式描述", "other_execution_desc", 500, False, _CONDITIONS["execution_other"], None, False, None),
+    (30, "指令执行方式概述", "execution_desc", 500, False, _CONDITIONS["first_or_change"], None, False, None),
+    (31, "账户最高申报速率", "max_order_rate", 20, False, _CONDITIONS["first_or_change"], "ORDER_RATES", False, None),
+    (32, "账户单日最高申报笔数", "max_daily_orders", 20, False, _CONDITIONS["first_or_change"], "DAILY_ORDER_COUNTS", False, None),
+
+    # Software Information (交易软件信息)
+    (33, "程序化交易软件名称及版本号", "software_name", 200, False, _CONDITIONS["first_or_change"], None, True, None),
+    (34, "程序化交易软件开发主体", "software_developer", 200, False, _CONDITIONS["first_or_change"], None, True, None),
+
+    # Other Information (其他)
+    (35, "高频交易系统服务器所在地", "hft_server_location", 100, False, _CONDITIONS["high_freq_no_exempt"], None, False, None),
+    (36, "联交所参与者联络人（选填）", "ep_contact", 80, False, None, None, False, None),
+    (37, "联交所参与者联络人联系方式（选填）", "ep_contact_info", 80, False, None, None, False, None),
+    (38, "投资者相关业务负责人（选填）", "investor_contact", 80, False, None, None, False, None),
+    (39, "投资者相关业务负责人联系方式（选填）", "investor_contact_info", 80, False, None, None, False, None),
+    (40, "是否上传测试报告及应急方案", "upload_test_report", 5, False, _CONDITIONS["first_or_change"], "YES_NO_EXEMPT", False, None),
+    (41, "合格境外投资者编码", "qfii_code", 50, False, _CONDITIONS["qfii_exemption"], None, False, None),
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _build_specs_cached(validator_cls: type, exchange_type: str) -> tuple[tuple[FieldSpec, ...], dict[str, int], dict[str, int]]:
+    """Build (specs, en_to_idx, cn_to_idx) for an exchange; built once per validator class and
+    shared by its instances
+
+    Enumerated values are read from validator_cls's attributes (REPORT_TYPES, YES_NO, ...)
+    when the specs are first built for it; changing them afterwards has no effect. The
+    returned objects are shared between instances and must not be mutated.
+    """
+    # Shenzhen has an extra 序号 field at position 0
+    field_defs = _SHENZHEN_FIELD_DEFS if exchange_type == "SHENZHEN" else _SHANGHAI_FIELD_DEFS
+
+    # Indices are dense (0..n-1), so specs are stored positionally
+    specs = [None] * (max(d[0] for d in field_defs) + 1)
+    for idx, name_cn, name_en, max_len, required, condition, valid_attr, multi, max_multi in field_defs:
+        req_mask, req_bits = condition or (0, 0)
+        valid_vals = getattr(validator_cls, valid_attr) if valid_attr else None
+        specs[idx] = FieldSpec(
+            index=idx,
+            name_cn=name_cn,
+            name_en=name_en,
+            max_length=max_len,
+            required=required,
+            req_mask=req_mask,
+            req_bits=req_bits,
+            valid_values=valid_vals,
+            multi_value=multi,
+            max_multi_count=max_multi
+        )
+
+    # Reverse lookups so field index resolution is O(1) instead of a scan per call
+    en_to_idx = {s.name_en: i for i, s in enumerate(specs)}
+    cn_to_idx = {}
+    for i, s in enumerate(specs):
+        # Keep the first match for duplicated Chinese names (e.g. Shenzhen "联系方式（选填）")
+        cn_to_idx.setdefault(s.name_cn, i)
+
+    return tuple(specs), en_to_idx, cn_to_idx
+
+
+@functools.lru_cache(maxsize=8)
+def _build_field_checks(validator_cls: type, exchange_type: str) -> tuple[tuple, ...]:
+    """Flatten each field spec into the tuple the per-row field loop unpacks
+
+    Structure: (index, spec, max_length, required, req_mask, req_bits, multi_value,
+    valid_set, enum_message). Built once per validator class and exchange so the row loop
+    does no attribute lookups or message formatting for passing fields.
+    """
+    specs = _build_specs_cached(validator_cls, exchange_type)[0]
+    return tuple(
+        (spec.index, spec, spec.max_length, spec.required, spec.req_mask, spec.req_bits, spec.multi_value,
+         spec.valid_set if spec.valid_values else None,
+         f"Must be one of: {spec.valid_text}" if spec.valid_values else "")
+        for spec in specs
+    )
+
+
 def main():
     """Main entry point"""
     if len(sys.argv) < 2:
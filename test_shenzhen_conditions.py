@@ -0,0 +1,74 @@
+"""Row checks for the Shenzhen conditional requirements
+
+Run with: python -m unittest test_shenzhen_conditions
+"""
+
+import unittest
+from datetime import datetime
+
+from ChinaTest import SSEValidator
+
+
+def _shenzhen_row(**cells) -> list[str]:
+    """A first-time Shenzhen report row with the required fields filled, plus `cells` by English field name"""
+    validator = _shenzhen_validator()
+    row = [""] * 38
+    row[1] = "测试参与者"
+    row[2] = "01234"
+    row[3] = "测试账户"
+    row[6] = "C000000001"
+    row[8] = "首次"
+    row[9] = "20250101"
+    for name_en, value in cells.items():
+        row[validator._get_field_idx(name_en)] = value
+    return row
+
+
+def _shenzhen_validator() -> SSEValidator:
+    validator = SSEValidator()
+    validator.exchange_type = "SHENZHEN"
+    validator.submission_date = datetime(2025, 1, 1)
+    validator.field_specs = validator._build_field_specs("SHENZHEN")
+    return validator
+
+
+def _required_fields(row: list[str]) -> set[str]:
+    """English names of the fields reported as missing required values for `row`"""
+    validator = _shenzhen_validator()
+    validator.validate_row(2, row)
+    return {e.field_name_en for e in validator.iter_errors() if e.message.startswith("Required field")}
+
+
+class ShenzhenConditionalRequirementTest(unittest.TestCase):
+
+    def test_main_strategy_required_when_quantitative(self):
+        self.assertIn("main_strategy", _required_fields(_shenzhen_row(is_quantitative="是")))
+        self.assertNotIn("main_strategy", _required_fields(_shenzhen_row(is_quantitative="否")))
+
+    def test_main_strategy_desc_required_when_main_strategy_filled(self):
+        row = _shenzhen_row(is_quantitative="是", main_strategy="量化套利策略")
+        self.assertIn("main_strategy_desc", _required_fields(row))
+        row = _shenzhen_row(is_quantitative="是", main_strategy="量化套利策略", main_strategy_desc="概述")
+        self.assertNotIn("main_strategy_desc", _required_fields(row))
+
+    def test_sub_strategy_desc_required_when_sub_strategy_filled(self):
+        self.assertIn("sub_strategy_desc", _required_fields(_shenzhen_row(sub_strategy="量化套利策略")))
+        self.assertNotIn("sub_strategy_desc", _required_fields(_shenzhen_row()))
+
+    def test_hft_server_location_required_for_high_frequency(self):
+        row = _shenzhen_row(max_order_rate="500笔及以上", upload_test_report="是")
+        self.assertIn("hft_server_location", _required_fields(row))
+        row = _shenzhen_row(max_order_rate="500笔及以上", upload_test_report="已申请豁免")
+        self.assertNotIn("hft_server_location", _required_fields(row))
+        row = _shenzhen_row(max_order_rate="100笔以下", upload_test_report="是")
+        self.assertNotIn("hft_server_location", _required_fields(row))
+
+    def test_qfii_code_required_when_high_frequency_report_not_uploaded(self):
+        row = _shenzhen_row(max_daily_orders="25000笔及以上", upload_test_report="否")
+        self.assertIn("qfii_code", _required_fields(row))
+        row = _shenzhen_row(max_daily_orders="25000笔及以上", upload_test_report="是")
+        self.assertNotIn("qfii_code", _required_fields(row))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""Checks that the python-calamine and openpyxl sheet readers return the same rows
+
+Run with: python -m unittest test_xlsx_readers
+"""
+
+import unittest
+import zipfile
+from io import BytesIO
+from unittest import mock
+
+import ChinaTest
+from ChinaTest import SSEValidator
+
+try:
+    import openpyxl
+    import python_calamine  # noqa: F401
+    HAVE_READERS = True
+except ImportError:
+    HAVE_READERS = False
+
+
+def _workbook_bytes(rows: list[list], preserve_space: bool = True) -> bytes:
+    """An xlsx holding `rows` below a Shanghai header row; strings in ERROR_CODES become error cells"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["联交所参与者名称", "经纪商代码"])
+    for row in rows:
+        ws.append(row)
+    buffer = BytesIO()
+    wb.save(buffer)
+    if preserve_space:
+        return buffer.getvalue()
+    # Rewrite the parts without xml:space="preserve", as some other writers produce them
+    output = BytesIO()
+    with zipfile.ZipFile(BytesIO(buffer.getvalue())) as zin, zipfile.ZipFile(output, "w") as zout:
+        for item in zin.infolist():
+            zout.writestr(item, zin.read(item.filename).replace(b' xml:space="preserve"', b""))
+    return output.getvalue()
+
+
+def _read_rows(data: bytes, use_calamine: bool) -> list[list[str]]:
+    validator = SSEValidator()
+    validator.exchange_type = "SHANGHAI"
+    if use_calamine:
+        return validator._read_xlsx(BytesIO(data), "test.xlsx")
+    with mock.patch.object(ChinaTest, "_read_first_sheet_calamine", return_value=None):
+        return validator._read_xlsx(BytesIO(data), "test.xlsx")
+
+
+@unittest.skipUnless(HAVE_READERS, "needs openpyxl and python-calamine")
+class XlsxReaderTest(unittest.TestCase):
+
+    def assert_same_rows(self, data: bytes, expected_count: int):
+        rows = _read_rows(data, use_calamine=True)
+        self.assertEqual(rows, _read_rows(data, use_calamine=False))
+        self.assertEqual(len(rows), expected_count)
+
+    def test_error_cells(self):
+        data = _workbook_bytes([
+            ["参与者A", "#N/A", "#DIV/0!"],
+            [None, "#N/A"],
+            [None, None, "#REF!"],
+            ["参与者B", "12345"],
+        ])
+        self.assert_same_rows(data, 4)
+
+    def test_whitespace_cells(self):
+        rows = [
+            ["参与者A", "  "],
+            [None, " "],
+            [" 参与者B ", "12345"],
+        ]
+        self.assert_same_rows(_workbook_bytes(rows), 3)
+        self.assert_same_rows(_workbook_bytes(rows, preserve_space=False), 3)
+
+    def test_plain_workbook_uses_calamine(self):
+        data = _workbook_bytes([["参与者A", "12345"], ["参与者B", 20250101]])
+        self.assertIsNotNone(ChinaTest._read_first_sheet_calamine(BytesIO(data)))
+        self.assert_same_rows(data, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
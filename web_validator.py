@@ -3,14 +3,73 @@ SSE Programmatic Trading Report Web Validator
 Flask web application for validating Excel files
 """
 from flask import Flask, render_template, request, jsonify
-import tempfile
-import os
+from collections import OrderedDict, deque
+from datetime import date
+import hashlib
+import threading
+import time
 from pathlib import Path
+from typing import Optional
 from ChinaTest import SSEValidator
 
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 
+# Recent validation responses, keyed by (content hash, filename, date) so re-uploading the
+# same file skips validation. The date is part of the key because filenames dated in the
+# future are rejected relative to today. Only the serialized JSON body is kept: responses
+# over RESPONSE_CACHE_MAX_ENTRY_BYTES are not cached, and least recently used entries are
+# evicted past RESPONSE_CACHE_MAX_BYTES in total. Entries hold uploaded account names and
+# client codes, so each also expires RESPONSE_CACHE_TTL seconds after it was stored, however
+# often it is hit; expiry is tracked in storage order, separately from the LRU order.
+RESPONSE_CACHE_MAX_BYTES = 8 * 1024 * 1024
+RESPONSE_CACHE_MAX_ENTRY_BYTES = 1024 * 1024
+RESPONSE_CACHE_TTL = 600
+_response_cache: OrderedDict = OrderedDict()  # cache key -> (expiry time, JSON body), least recently used first
+_response_expiry: deque = deque()  # (expiry time, cache key), in storage (and so expiry) order
+_response_cache_bytes = 0
+_response_cache_lock = threading.Lock()
+
+def _evict_responses(now: float):
+    """Drop expired entries, then least recently used entries while over the byte limit (lock held)"""
+    global _response_cache_bytes
+    while _response_expiry and _response_expiry[0][0] <= now:
+        expires, cache_key = _response_expiry.popleft()
+        entry = _response_cache.get(cache_key)
+        # The key may have been evicted already, or stored again with a later expiry
+        if entry is not None and entry[0] == expires:
+            del _response_cache[cache_key]
+            _response_cache_bytes -= len(entry[1])
+    while _response_cache_bytes > RESPONSE_CACHE_MAX_BYTES:
+        _, (_, body) = _response_cache.popitem(last=False)
+        _response_cache_bytes -= len(body)
+
+def _get_cached_response(cache_key) -> Optional[bytes]:
+    """Return the cached JSON body for cache_key, or None"""
+    with _response_cache_lock:
+        _evict_responses(time.monotonic())
+        entry = _response_cache.get(cache_key)
+        if entry is None:
+            return None
+        _response_cache.move_to_end(cache_key)
+        return entry[1]
+
+def _cache_response(cache_key, body: bytes):
+    """Cache a serialized JSON response body unless it is too large"""
+    global _response_cache_bytes
+    if len(body) > RESPONSE_CACHE_MAX_ENTRY_BYTES:
+        return
+    with _response_cache_lock:
+        old = _response_cache.pop(cache_key, None)
+        if old is not None:
+            _response_cache_bytes -= len(old[1])
+        now = time.monotonic()
+        expires = now + RESPONSE_CACHE_TTL
+        _response_cache[cache_key] = (expires, body)
+        _response_expiry.append((expires, cache_key))
+        _response_cache_bytes += len(body)
+        _evict_responses(now)
+
 @app.route('/')
 def index():
     """Main page with file upload form"""
@@ -30,67 +89,81 @@ def validate_file():
     if not file.filename.endswith('.xlsx'):
         return jsonify({'error': 'Only Excel files (.xlsx) are supported'}), 400
 
-    # Create temporary file (automatically deleted after use)
-    with tempfile.NamedTemporaryFile(delete=True, suffix='.xlsx') as tmp_file:
-        try:
-            # Save uploaded file to temporary location
-            file.save(tmp_file.name)
-
-            # Validate the file (pass original filename for exchange detection)
-            validator = SSEValidator()
-            is_valid, errors = validator.validate_file(tmp_file.name, original_filename=file.filename)
-
-            # Generate report
-            report = validator.generate_report()
-
-            # Prepare response with structured data
-            response = {
-                'is_valid': is_valid,
-                'report': report,
-                'exchange_type': validator.exchange_type,  # Include detected exchange type
-                'firm_id': validator.firm_id,  # Include broker code from filename
-                'submission_date': validator.submission_date.strftime('%Y%m%d') if validator.submission_date else None,
-                'summary': {
-                    'total_rows': len(validator.row_results),
-                    'valid_rows': len([r for r in validator.row_results if r.is_valid]),
-                    'invalid_rows': len([r for r in validator.row_results if not r.is_valid]),
-                    'total_errors': len([e for e in validator.errors if e.severity.value == 'ERROR']),
-                    'total_warnings': len([e for e in validator.errors if e.severity.value == 'WARNING'])
-                },
-                'row_results': [
-                    {
-                        'row_num': r.row_num,
-                        'account_name': r.account_name,
-                        'client_code': r.client_code,
-                        'is_valid': r.is_valid,
-                        'error_count': r.error_count,
-                        'warning_count': r.warning_count
-                    }
-                    for r in validator.row_results
-                ],
-                'errors': [
-                    {
-                        'row_num': e.row_num,
-                        'field_name_cn': e.field_name_cn,
-                        'field_name_en': e.field_name_en,
-                        'field_col': e.field_col,
-                        'message': e.message,
-                        'value': e.field_value,
-                        'severity': e.severity.value,
-                        'account_name': e.account_name,
-                        'client_code': e.client_code
-                    }
-                    for e in validator.errors
-                ]
-            }
-
-            return jsonify(response)
-
-        except Exception as e:
-            return jsonify({'error': f'Validation error: {str(e)}'}), 500
-
-        # Temporary file is automatically deleted when exiting the 'with' block
-        # No uploaded data is saved to disk
+    data = file.read()
+    cache_key = (hashlib.blake2b(data, digest_size=16).digest(), file.filename, date.today())
+    body = _get_cached_response(cache_key)
+    if body is not None:
+        return app.response_class(body, mimetype='application/json')
+
+    try:
+        # Validate the upload in memory (capped by MAX_CONTENT_LENGTH); no uploaded data is
+        # saved to disk. The original filename is used for exchange detection
+        validator = SSEValidator()
+        is_valid, errors = validator.validate_file_bytes(data, original_filename=file.filename)
+
+        # Generate report
+        report = validator.generate_report()
+
+        # Serialize errors and rows, counting severities and valid rows in the same pass
+        error_dicts = []
+        total_errors = 0
+        total_warnings = 0
+        for e in errors:
+            severity = e.severity.value
+            if severity == 'ERROR':
+                total_errors += 1
+            elif severity == 'WARNING':
+                total_warnings += 1
+            error_dicts.append({
+                'row_num': e.row_num,
+                'field_name_cn': e.field_name_cn,
+                'field_name_en': e.field_name_en,
+                'field_col': e.field_col,
+                'message': e.message,
+                'value': e.field_value,
+                'severity': severity,
+                'account_name': e.account_name,
+                'client_code': e.client_code
+            })
+
+        row_dicts = []
+        valid_rows = 0
+        for r in validator.row_results:
+            if r.is_valid:
+                valid_rows += 1
+            row_dicts.append({
+                'row_num': r.row_num,
+                'account_name': r.account_name,
+                'client_code': r.client_code,
+                'is_valid': r.is_valid,
+                'error_count': r.error_count,
+                'warning_count': r.warning_count
+            })
+
+        # Prepare response with structured data
+        response = {
+            'is_valid': is_valid,
+            'report': report,
+            'exchange_type': validator.exchange_type,  # Include detected exchange type
+            'firm_id': validator.firm_id,  # Include broker code from filename
+            'submission_date': validator.submission_date.strftime('%Y%m%d') if validator.submission_date else None,
+            'summary': {
+                'total_rows': len(row_dicts),
+                'valid_rows': valid_rows,
+                'invalid_rows': len(row_dicts) - valid_rows,
+                'total_errors': total_errors,
+                'total_warnings': total_warnings
+            },
+            'row_results': row_dicts,
+            'errors': error_dicts
+        }
+
+        result = jsonify(response)
+        _cache_response(cache_key, result.get_data())
+        return result
+
+    except Exception as e:
+        return jsonify({'error': f'Validation error: {str(e)}'}), 500
 
 @app.route('/download-template')
 def download_template():